@@ -3,17 +3,75 @@
 
 import os
 import json
+import asyncio
 import logging
+import mimetypes
+from functools import lru_cache
 import requests
+import httpx
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, Any, Optional, Union, List
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import torch
+import numpy as np
+
+# 优先使用orjson解析转写结果，长音频返回的分段列表解析更快
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+# requests构造multipart请求体时会把整个文件读入内存，安装requests_toolbelt后改为边读边发
+try:
+    from requests_toolbelt import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 log = logging.getLogger("speech_service")
 
+
+# 上传音频时文件读取的缓冲区大小，HTTP客户端按小块读取时可减少read系统调用
+UPLOAD_BUFFER_SIZE = 1 << 20
+
+
+def create_http_session(pool_maxsize: int = 16) -> requests.Session:
+    """创建带连接池和重试的HTTP会话，复用TCP/TLS连接"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(total=2, backoff_factor=0.2)
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@lru_cache(maxsize=1)
+def cuda_device_count() -> int:
+    """通过CTranslate2获取可见的CUDA设备数，无需导入torch"""
+    try:
+        import ctranslate2
+        return ctranslate2.get_cuda_device_count()
+    except Exception:
+        return 0
+
+
+def cuda_available() -> bool:
+    """通过CTranslate2检测是否有可用的CUDA设备"""
+    return cuda_device_count() > 0
+
+
+@lru_cache(maxsize=64)
+def guess_audio_mime(ext: str) -> str:
+    """按扩展名推断音频MIME类型，无法检测时默认为wav"""
+    mime, _ = mimetypes.guess_type(f"audio{ext}")
+    return mime or "audio/wav"
+
+
 class SpeechTranscriptionService(ABC):
     """语音转写服务的抽象基类"""
     
@@ -27,10 +85,18 @@ class SpeechTranscriptionService(ABC):
         """转写音频文件"""
         pass
     
+    async def atranscribe(self, audio_file: str, language: Optional[str] = None) -> Dict[str, Any]:
+        """异步转写音频文件，默认在线程池中执行transcribe，避免阻塞事件循环"""
+        return await asyncio.to_thread(self.transcribe, audio_file, language)
+    
     def cleanup(self) -> None:
         """清理资源（如果需要）"""
         pass
     
+    async def acleanup(self) -> None:
+        """在事件循环中清理资源，默认调用cleanup；持有异步客户端的服务需要在这里关闭它"""
+        self.cleanup()
+    
     @property
     def name(self) -> str:
         """获取服务名称"""
@@ -41,38 +107,67 @@ class LocalWhisperService(SpeechTranscriptionService):
     """本地Faster-Whisper模型服务"""
     
     def __init__(self, model_name: str = "base", device: str = None, 
-                 compute_type: str = "int8", download_root: str = "./models",
-                 vad_filter: bool = True):
+                 compute_type: str = "auto", download_root: str = "./models",
+                 vad_filter: bool = True, vad_parameters: Optional[Dict[str, Any]] = None,
+                 batch_size: int = 1, batch_window_ms: int = 50):
         """
         初始化本地Whisper服务
         
         Args:
             model_name: 模型名称 ("tiny", "base", "small", "medium", "large", "large-v2", "large-v3")
             device: 设备类型 ("cuda", "cpu", "auto")
-            compute_type: 计算类型 ("float16", "int8", "int4")
+            compute_type: 计算类型 ("auto", "float16", "int8_float16", "int8")，
+                "auto" 在GPU上使用int8_float16，其余情况交由CTranslate2自动选择
             download_root: 模型下载和缓存目录
             vad_filter: 是否使用语音活动检测过滤
+            vad_parameters: 传给faster-whisper Silero VAD的参数，默认最小静音500ms、阈值0.5
+            batch_size: 并发请求合并推理时每批最多的30秒窗口数，1表示不合并
+            batch_window_ms: 合并推理时收集并发请求的等待时间（毫秒）
         """
         self.model_name = model_name
-        self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+        self.device = device or ("cuda" if cuda_available() else "cpu")
         self.compute_type = compute_type
         self.download_root = download_root
         self.vad_filter = vad_filter
+        self.vad_parameters = vad_parameters or {"min_silence_duration_ms": 500, "threshold": 0.5}
         self.model = None
+        # 多GPU时在每张卡上各加载一份模型副本，CTranslate2把并发调用分发到空闲的副本上
+        self.device_index = list(range(cuda_device_count())) if self.device == "cuda" else [0]
+        # 推理专用执行器，每个设备一个线程：同一设备上并发推理只会争抢同一个CUDA上下文和显存
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(self.device_index) or 1, thread_name_prefix="whisper"
+        )
+        self.batch_size = batch_size
+        self.batch_window = batch_window_ms / 1000.0
+        self._batch_queue = None
+        self._batch_task = None
+        self._batch_prompts = {}
         
         # 创建模型目录
         os.makedirs(download_root, exist_ok=True)
     
     def initialize(self) -> bool:
         """初始化Faster-Whisper模型"""
+        if self.model is not None:
+            return True
+        
         try:
             from faster_whisper import WhisperModel
             
-            log.info(f"正在加载Whisper模型 {self.model_name}，设备: {self.device}")
+            # GPU上使用int8权重+fp16激活，比纯int8更快且显存减半
+            compute_type = self.compute_type
+            if compute_type == "auto" and self.device == "cuda":
+                compute_type = "int8_float16"
+            
+            log.info(
+                f"正在加载Whisper模型 {self.model_name}，设备: {self.device} {self.device_index}，"
+                f"计算类型: {compute_type}"
+            )
             self.model = WhisperModel(
                 model_size_or_path=self.model_name,
                 device=self.device,
-                compute_type=self.compute_type,
+                device_index=self.device_index or 0,
+                compute_type=compute_type,
                 download_root=self.download_root
             )
             log.info(f"Whisper模型 {self.model_name} 加载完成")
@@ -81,8 +176,31 @@ class LocalWhisperService(SpeechTranscriptionService):
             log.error(f"加载Whisper模型失败: {str(e)}")
             return False
     
-    def transcribe(self, audio_file: str, language: Optional[str] = None) -> Dict[str, Any]:
-        """使用本地Whisper模型转写音频"""
+    def warmup(self) -> None:
+        """用1秒静音跑一次推理，提前完成CTranslate2内核和cuBLAS/cuDNN的首次初始化"""
+        if not self.model:
+            return
+        
+        try:
+            segments, _ = self.model.transcribe(
+                np.zeros(16000, dtype=np.float32),
+                beam_size=1,
+                vad_filter=False,
+            )
+            # segments是惰性生成器，需要消费后才会真正执行解码
+            for _ in segments:
+                pass
+            
+            # 静音会被VAD整段过滤掉，上面的推理没有启用VAD，这里单独预加载VAD的ONNX会话
+            if self.vad_filter:
+                from faster_whisper.vad import get_vad_model
+                get_vad_model()
+            log.info(f"Whisper模型 {self.model_name} 预热完成")
+        except Exception as e:
+            log.warning(f"Whisper模型预热失败: {str(e)}")
+    
+    def transcribe(self, audio_file: Union[str, np.ndarray], language: Optional[str] = None) -> Dict[str, Any]:
+        """使用本地Whisper模型转写音频，audio_file可以是文件路径或16kHz单声道float32采样数组"""
         if not self.model:
             if not self.initialize():
                 raise RuntimeError("模型初始化失败")
@@ -92,6 +210,7 @@ class LocalWhisperService(SpeechTranscriptionService):
                 audio_file,
                 beam_size=5,
                 vad_filter=self.vad_filter,
+                vad_parameters=self.vad_parameters,
                 language=language,
             )
             
@@ -99,12 +218,169 @@ class LocalWhisperService(SpeechTranscriptionService):
                 f"检测到语言 '{info.language}' 可信度 {info.language_probability:.2f}"
             )
             
-            transcript = "".join([segment.text for segment in list(segments)])
+            transcript = "".join(segment.text for segment in segments)
             return {"text": transcript.strip(), "language": info.language}
         
         except Exception as e:
             log.exception(f"转写音频文件时出错: {str(e)}")
             raise
+    
+    async def atranscribe(self, audio_file: Union[str, np.ndarray], language: Optional[str] = None) -> Dict[str, Any]:
+        """
+        在推理专用线程中转写音频，不阻塞事件循环
+        
+        启用合并推理（batch_size > 1）且指定了语言时，内存中的采样数组会与同一时间窗口内的
+        其他请求合并为一次批量推理
+        """
+        if self.batch_size > 1 and language and isinstance(audio_file, np.ndarray):
+            return await self._atranscribe_batched(audio_file, language)
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.transcribe, audio_file, language)
+    
+    def _speech_only(self, audio: np.ndarray) -> np.ndarray:
+        """用Silero VAD找出语音片段，只保留这些采样拼接后的数组"""
+        from faster_whisper.vad import VadOptions, get_speech_timestamps
+        
+        chunks = get_speech_timestamps(audio, VadOptions(**self.vad_parameters))
+        if not chunks:
+            return audio[:0]
+        return np.concatenate([audio[chunk["start"]:chunk["end"]] for chunk in chunks])
+    
+    def _window_features(self, audio: np.ndarray) -> List[np.ndarray]:
+        """
+        对整段音频做一次log-mel特征提取，再按30秒切成补齐到固定帧数的窗口
+        
+        与faster-whisper自身的转写流程一致：STFT和mel滤波只对整段数组做一次向量化计算，
+        而不是每个窗口各算一遍
+        """
+        from faster_whisper.audio import pad_or_trim
+        
+        # 合并推理直接调用底层generate，不经过faster-whisper的VAD，这里先去掉静音，
+        # 兑现vad_filter并减少需要解码的窗口数
+        if self.vad_filter:
+            audio = self._speech_only(audio)
+            if not len(audio):
+                return []
+        
+        extractor = self.model.feature_extractor
+        features = extractor(audio)
+        frames = extractor.nb_max_frames
+        # 特征末尾的padding帧不足一个窗口时不单独成窗
+        n_frames = max(len(audio) // extractor.hop_length, 1)
+        return [
+            pad_or_trim(features[:, start:start + frames], frames)
+            for start in range(0, n_frames, frames)
+        ]
+    
+    def _batch_prompt(self, language: str) -> tuple:
+        """
+        返回指定语言的分词器和解码提示，按语言缓存
+        
+        语言无效时抛出ValueError；在请求入队前调用，只让这一个请求失败，不影响同批的其他请求
+        """
+        if language not in self._batch_prompts:
+            from faster_whisper.tokenizer import Tokenizer
+            
+            tokenizer = Tokenizer(
+                self.model.hf_tokenizer,
+                self.model.model.is_multilingual,
+                task="transcribe",
+                language=language,
+            )
+            prompt = list(tokenizer.sot_sequence) + [tokenizer.no_timestamps]
+            self._batch_prompts[language] = (tokenizer, prompt)
+        return self._batch_prompts[language]
+    
+    def _generate_batch(self, items: List[tuple]) -> List[str]:
+        """对多个请求的窗口特征做一次批量解码，按请求返回拼接后的文本"""
+        import ctranslate2
+        
+        features, prompts, owners = [], [], []
+        for index, (windows, _, prompt) in enumerate(items):
+            for window in windows:
+                features.append(window)
+                prompts.append(prompt)
+                owners.append(index)
+        
+        # 每次generate最多解码batch_size个窗口，单个长音频不会把几百个窗口塞进一次解码导致显存不足
+        results = []
+        for start in range(0, len(features), self.batch_size):
+            results.extend(self.model.model.generate(
+                ctranslate2.StorageView.from_array(
+                    np.ascontiguousarray(np.stack(features[start:start + self.batch_size]))
+                ),
+                prompts[start:start + self.batch_size],
+                beam_size=5,
+            ))
+        
+        texts = [[] for _ in items]
+        for owner, result in zip(owners, results):
+            texts[owner].append(items[owner][1].decode(result.sequences_ids[0]))
+        return ["".join(parts) for parts in texts]
+    
+    async def _batch_worker(self) -> None:
+        """收集等待窗口内到达的请求，合并为一次批量推理后把结果分发回各请求"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._batch_queue.get()]
+            n_windows = len(batch[0][0])
+            deadline = loop.time() + self.batch_window
+            while n_windows < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._batch_queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                n_windows += len(item[0])
+            
+            log.info(f"合并推理: {len(batch)} 个请求, {n_windows} 个窗口")
+            try:
+                texts = await loop.run_in_executor(
+                    self._executor,
+                    self._generate_batch,
+                    [(windows, tokenizer, prompt) for windows, tokenizer, prompt, _, _ in batch],
+                )
+            except Exception as e:
+                log.exception(f"合并推理出错: {str(e)}")
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (*_, language, future), text in zip(batch, texts):
+                if not future.done():
+                    future.set_result({"text": text.strip(), "language": language})
+    
+    async def _atranscribe_batched(self, audio: np.ndarray, language: str) -> Dict[str, Any]:
+        """把请求放入合并推理队列并等待结果"""
+        if not self.model:
+            if not self.initialize():
+                raise RuntimeError("模型初始化失败")
+        
+        if self._batch_task is None:
+            self._batch_queue = asyncio.Queue()
+            self._batch_task = asyncio.create_task(self._batch_worker())
+        
+        # 先校验语言并构造解码提示，无效语言只让当前请求失败
+        tokenizer, prompt = self._batch_prompt(language)
+        windows = await asyncio.to_thread(self._window_features, audio)
+        if not windows:
+            return {"text": "", "language": language}
+        future = asyncio.get_running_loop().create_future()
+        await self._batch_queue.put((windows, tokenizer, prompt, language, future))
+        return await future
+    
+    def cleanup(self) -> None:
+        """等待进行中的推理结束并释放模型"""
+        if self._batch_task is not None:
+            self._batch_task.cancel()
+            self._batch_task = None
+        self._executor.shutdown(wait=True)
+        self.model = None
 
 
 class RemoteWhisperService(SpeechTranscriptionService):
@@ -120,6 +396,17 @@ class RemoteWhisperService(SpeechTranscriptionService):
         """
         self.api_url = api_url
         self.timeout = timeout
+        self._session = create_http_session()
+        self._aclient = httpx.AsyncClient(http2=True, timeout=timeout)
+    
+    def cleanup(self) -> None:
+        """关闭HTTP连接池"""
+        self._session.close()
+    
+    async def acleanup(self) -> None:
+        """关闭同步和异步HTTP连接池"""
+        self.cleanup()
+        await self._aclient.aclose()
     
     def initialize(self) -> bool:
         """检查远程服务是否可用"""
@@ -129,7 +416,7 @@ class RemoteWhisperService(SpeechTranscriptionService):
         
         try:
             # 尝试检查服务是否可用
-            response = requests.get(
+            response = self._session.get(
                 f"{self.api_url}/health", 
                 timeout=self.timeout
             )
@@ -143,52 +430,106 @@ class RemoteWhisperService(SpeechTranscriptionService):
             log.warning(f"无法连接到远程Whisper服务: {str(e)}")
             return True  # 仍然返回True，等到实际转写时再处理错误
     
+    def _request_data(self, language: Optional[str]) -> Dict[str, str]:
+        """构造转写请求的表单字段"""
+        data = {}
+        if language:
+            data["language"] = language
+            log.info(f"使用语言设置: {language}")
+        
+        log.info(f"发送请求到远程Whisper服务: {self.api_url}/transcribe")
+        return data
+    
+    def _read_timeout(self, audio_file: str) -> float:
+        """按文件大小计算读取超时：在基础超时之上每MB音频再加1秒，避免大文件转写被过早中断"""
+        return self.timeout + os.path.getsize(audio_file) / (1 << 20)
+    
+    def _http_error(self, response, e: Exception) -> RuntimeError:
+        """将远程服务返回的HTTP错误转换为RuntimeError"""
+        log.error(f"远程Whisper服务返回HTTP错误: {str(e)}")
+        error_detail = "未知错误"
+        try:
+            error_json = response.json()
+            if "error" in error_json:
+                error_detail = error_json["error"]
+        except:
+            error_detail = response.text[:100] if response.text else str(e)
+            
+        if response.status_code == 404:
+            return RuntimeError(f"远程Whisper服务API端点不存在 (/transcribe)")
+        elif response.status_code == 415:
+            return RuntimeError(f"不支持的媒体类型，请检查音频格式")
+        else:
+            return RuntimeError(f"远程Whisper服务错误: 状态码 {response.status_code}, {error_detail}")
+    
     def transcribe(self, audio_file: str, language: Optional[str] = None) -> Dict[str, Any]:
         """使用远程Whisper API转写音频"""
         try:
-            with open(audio_file, "rb") as f:
-                files = {"file": (os.path.basename(audio_file), f)}
-                data = {}
+            read_timeout = self._read_timeout(audio_file)
+            with open(audio_file, "rb", buffering=UPLOAD_BUFFER_SIZE) as f:
+                filename = os.path.basename(audio_file)
+                data = self._request_data(language)
+                if MultipartEncoder is not None:
+                    mime = guess_audio_mime(os.path.splitext(audio_file)[1].lower())
+                    encoder = MultipartEncoder(fields={**data, "file": (filename, f, mime)})
+                    response = self._session.post(
+                        f"{self.api_url}/transcribe",
+                        data=encoder,
+                        headers={"Content-Type": encoder.content_type},
+                        timeout=(self.timeout, read_timeout)
+                    )
+                else:
+                    response = self._session.post(
+                        f"{self.api_url}/transcribe",
+                        files={"file": (filename, f)},
+                        data=data,
+                        timeout=(self.timeout, read_timeout)
+                    )
                 
-                if language:
-                    data["language"] = language
-                    log.info(f"使用语言设置: {language}")
+                response.raise_for_status()
+                return json_loads(response.content)
                 
-                log.info(f"发送请求到远程Whisper服务: {self.api_url}/transcribe")
-                response = requests.post(
+        except requests.exceptions.ConnectionError as e:
+            log.error(f"连接到远程Whisper服务失败: {str(e)}")
+            raise RuntimeError(f"无法连接到远程Whisper服务 {self.api_url}: {str(e)}")
+        
+        except requests.exceptions.Timeout as e:
+            log.error(f"远程Whisper服务请求超时: {str(e)}")
+            raise RuntimeError(f"远程Whisper服务请求超时: {str(e)}")
+        
+        except requests.exceptions.HTTPError as e:
+            raise self._http_error(response, e)
+        
+        except Exception as e:
+            log.exception(f"转写请求处理出错: {str(e)}")
+            raise RuntimeError(f"转写请求处理出错: {str(e)}")
+    
+    async def atranscribe(self, audio_file: str, language: Optional[str] = None) -> Dict[str, Any]:
+        """使用远程Whisper API异步转写音频"""
+        try:
+            read_timeout = self._read_timeout(audio_file)
+            with open(audio_file, "rb", buffering=UPLOAD_BUFFER_SIZE) as f:
+                files = {"file": (os.path.basename(audio_file), f)}
+                response = await self._aclient.post(
                     f"{self.api_url}/transcribe",
                     files=files,
-                    data=data,
-                    timeout=self.timeout
+                    data=self._request_data(language),
+                    timeout=httpx.Timeout(self.timeout, read=read_timeout),
                 )
                 
                 response.raise_for_status()
-                return response.json()
+                return json_loads(response.content)
                 
-        except requests.exceptions.ConnectionError as e:
+        except httpx.ConnectError as e:
             log.error(f"连接到远程Whisper服务失败: {str(e)}")
             raise RuntimeError(f"无法连接到远程Whisper服务 {self.api_url}: {str(e)}")
         
-        except requests.exceptions.Timeout as e:
+        except httpx.TimeoutException as e:
             log.error(f"远程Whisper服务请求超时: {str(e)}")
             raise RuntimeError(f"远程Whisper服务请求超时: {str(e)}")
         
-        except requests.exceptions.HTTPError as e:
-            log.error(f"远程Whisper服务返回HTTP错误: {str(e)}")
-            error_detail = "未知错误"
-            try:
-                error_json = response.json()
-                if "error" in error_json:
-                    error_detail = error_json["error"]
-            except:
-                error_detail = response.text[:100] if response.text else str(e)
-                
-            if response.status_code == 404:
-                raise RuntimeError(f"远程Whisper服务API端点不存在 (/transcribe)")
-            elif response.status_code == 415:
-                raise RuntimeError(f"不支持的媒体类型，请检查音频格式")
-            else:
-                raise RuntimeError(f"远程Whisper服务错误: 状态码 {response.status_code}, {error_detail}")
+        except httpx.HTTPStatusError as e:
+            raise self._http_error(response, e)
         
         except Exception as e:
             log.exception(f"转写请求处理出错: {str(e)}")
@@ -210,6 +551,17 @@ class OpenAIWhisperService(SpeechTranscriptionService):
         self.api_key = api_key
         self.api_base_url = api_base_url
         self.model = model
+        self._session = create_http_session()
+        self._aclient = httpx.AsyncClient(http2=True, timeout=None)
+    
+    def cleanup(self) -> None:
+        """关闭HTTP连接池"""
+        self._session.close()
+    
+    async def acleanup(self) -> None:
+        """关闭同步和异步HTTP连接池"""
+        self.cleanup()
+        await self._aclient.aclose()
     
     def initialize(self) -> bool:
         """验证API密钥和基础URL"""
@@ -223,43 +575,74 @@ class OpenAIWhisperService(SpeechTranscriptionService):
         
         return True
     
+    def _request_kwargs(self, language: Optional[str]) -> Dict[str, Any]:
+        """构造转写请求的URL、请求头和表单字段"""
+        return {
+            "url": f"{self.api_base_url}/audio/transcriptions",
+            "headers": {"Authorization": f"Bearer {self.api_key}"},
+            "data": {
+                "model": self.model,
+                **({"language": language} if language else {})
+            },
+        }
+    
+    def _error(self, response, e: Exception) -> RuntimeError:
+        """从OpenAI的错误响应中提取错误信息"""
+        log.exception(f"OpenAI Whisper转写失败: {str(e)}")
+        error_detail = None
+        try:
+            res = response.json()
+            if "error" in res:
+                error_detail = f"OpenAI错误: {res['error'].get('message', '')}"
+        except:
+            error_detail = f"OpenAI错误: {str(e)}"
+        
+        return RuntimeError(error_detail or "OpenAI Whisper服务连接错误")
+    
     def transcribe(self, audio_file: str, language: Optional[str] = None) -> Dict[str, Any]:
         """使用OpenAI Whisper API转写音频"""
         if not self.initialize():
             raise RuntimeError("OpenAI Whisper服务初始化失败")
         
+        response = None
         try:
-            with open(audio_file, "rb") as f:
-                response = requests.post(
-                    f"{self.api_base_url}/audio/transcriptions",
-                    headers={"Authorization": f"Bearer {self.api_key}"},
+            with open(audio_file, "rb", buffering=UPLOAD_BUFFER_SIZE) as f:
+                response = self._session.post(
                     files={"file": (os.path.basename(audio_file), f)},
-                    data={
-                        "model": self.model,
-                        **({"language": language} if language else {})
-                    }
+                    **self._request_kwargs(language)
                 )
             
             response.raise_for_status()
-            return response.json()
+            return json_loads(response.content)
             
         except Exception as e:
-            log.exception(f"OpenAI Whisper转写失败: {str(e)}")
-            error_detail = None
-            try:
-                if hasattr(response, "json"):
-                    res = response.json()
-                    if "error" in res:
-                        error_detail = f"OpenAI错误: {res['error'].get('message', '')}"
-            except:
-                error_detail = f"OpenAI错误: {str(e)}"
+            raise self._error(response, e)
+    
+    async def atranscribe(self, audio_file: str, language: Optional[str] = None) -> Dict[str, Any]:
+        """使用OpenAI Whisper API异步转写音频"""
+        if not self.initialize():
+            raise RuntimeError("OpenAI Whisper服务初始化失败")
+        
+        response = None
+        try:
+            with open(audio_file, "rb", buffering=UPLOAD_BUFFER_SIZE) as f:
+                response = await self._aclient.post(
+                    files={"file": (os.path.basename(audio_file), f)},
+                    **self._request_kwargs(language)
+                )
+            
+            response.raise_for_status()
+            return json_loads(response.content)
             
-            raise RuntimeError(error_detail or "OpenAI Whisper服务连接错误")
+        except Exception as e:
+            raise self._error(response, e)
 
 
 class DeepgramService(SpeechTranscriptionService):
     """Deepgram API服务"""
     
+    API_URL = "https://api.deepgram.com/v1/listen"
+    
     def __init__(self, api_key: str, model: Optional[str] = None):
         """
         初始化Deepgram服务
@@ -270,6 +653,17 @@ class DeepgramService(SpeechTranscriptionService):
         """
         self.api_key = api_key
         self.model = model
+        self._session = create_http_session()
+        self._aclient = httpx.AsyncClient(http2=True, timeout=None)
+    
+    def cleanup(self) -> None:
+        """关闭HTTP连接池"""
+        self._session.close()
+    
+    async def acleanup(self) -> None:
+        """关闭同步和异步HTTP连接池"""
+        self.cleanup()
+        await self._aclient.aclose()
     
     def initialize(self) -> bool:
         """验证API密钥"""
@@ -279,45 +673,70 @@ class DeepgramService(SpeechTranscriptionService):
         
         return True
     
+    def _request_kwargs(self, audio_file: str) -> Dict[str, Any]:
+        """构造转写请求的请求头和查询参数"""
+        headers = {
+            "Authorization": f"Token {self.api_key}",
+            "Content-Type": guess_audio_mime(os.path.splitext(audio_file)[1].lower()),
+        }
+        
+        # 查询参数统一放在params中：httpx传入params时会替换掉URL中原有的查询字符串
+        params = {"smart_format": "true"}
+        if self.model:
+            params["model"] = self.model
+        
+        return {"headers": headers, "params": params}
+    
+    def _parse_response(self, response_data: Dict[str, Any]) -> Dict[str, Any]:
+        """从Deepgram响应中提取转写文本"""
+        try:
+            transcript = response_data["results"]["channels"][0]["alternatives"][0].get("transcript", "")
+            return {"text": transcript.strip()}
+        except (KeyError, IndexError) as e:
+            log.error(f"Deepgram响应格式错误: {str(e)}")
+            raise RuntimeError("解析Deepgram响应失败 - 意外的响应格式")
+    
     def transcribe(self, audio_file: str, language: Optional[str] = None) -> Dict[str, Any]:
         """使用Deepgram API转写音频"""
         if not self.initialize():
             raise RuntimeError("Deepgram服务初始化失败")
         
         try:
-            import mimetypes
-            mime, _ = mimetypes.guess_type(audio_file)
-            if not mime:
-                mime = "audio/wav"  # 无法检测时默认为wav
-                
-            with open(audio_file, "rb") as f:
-                file_data = f.read()
-                
-            headers = {
-                "Authorization": f"Token {self.api_key}",
-                "Content-Type": mime,
-            }
+            # 直接传文件对象，requests边读边发送，不把整个文件读入内存
+            with open(audio_file, "rb", buffering=UPLOAD_BUFFER_SIZE) as f:
+                response = self._session.post(
+                    self.API_URL,
+                    data=f,
+                    **self._request_kwargs(audio_file)
+                )
             
-            params = {}
-            if self.model:
-                params["model"] = self.model
+            response.raise_for_status()
+            return self._parse_response(json_loads(response.content))
                 
-            response = requests.post(
-                "https://api.deepgram.com/v1/listen?smart_format=true",
-                headers=headers,
-                params=params,
-                data=file_data,
+        except Exception as e:
+            log.exception(f"Deepgram转写失败: {str(e)}")
+            raise RuntimeError(f"Deepgram服务错误: {str(e)}")
+    
+    async def atranscribe(self, audio_file: str, language: Optional[str] = None) -> Dict[str, Any]:
+        """使用Deepgram API异步转写音频"""
+        if not self.initialize():
+            raise RuntimeError("Deepgram服务初始化失败")
+        
+        async def file_sender():
+            with open(audio_file, "rb") as f:
+                while chunk := await asyncio.to_thread(f.read, UPLOAD_BUFFER_SIZE):
+                    yield chunk
+        
+        try:
+            # 分块读取并发送文件，不把整个文件读入内存
+            response = await self._aclient.post(
+                self.API_URL,
+                content=file_sender(),
+                **self._request_kwargs(audio_file)
             )
             
             response.raise_for_status()
-            response_data = response.json()
-            
-            try:
-                transcript = response_data["results"]["channels"][0]["alternatives"][0].get("transcript", "")
-                return {"text": transcript.strip()}
-            except (KeyError, IndexError) as e:
-                log.error(f"Deepgram响应格式错误: {str(e)}")
-                raise RuntimeError("解析Deepgram响应失败 - 意外的响应格式")
+            return self._parse_response(json_loads(response.content))
                 
         except Exception as e:
             log.exception(f"Deepgram转写失败: {str(e)}")
@@ -346,6 +765,23 @@ class SpeechServiceManager:
         log.info(f"当前语音服务设置为: {service_id}")
         return True
     
+    def initialize_all(self) -> Dict[str, bool]:
+        """并发初始化所有注册的服务，本地模型加载与远程服务的健康检查互相重叠"""
+        if not self.services:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=len(self.services)) as executor:
+            futures = {sid: executor.submit(service.initialize) for sid, service in self.services.items()}
+        return {sid: future.result() for sid, future in futures.items()}
+    
+    async def acleanup_all(self) -> None:
+        """清理所有注册的服务，在应用关闭时调用"""
+        for sid, service in self.services.items():
+            try:
+                await service.acleanup()
+            except Exception as e:
+                log.warning(f"清理语音服务 {sid} 时出错: {str(e)}")
+    
     def get_service(self, service_id: Optional[str] = None) -> SpeechTranscriptionService:
         """获取指定的语音服务，如果未指定则返回当前服务"""
         sid = service_id or self.current_service
@@ -386,8 +822,12 @@ def create_speech_service_manager(config: Dict[str, Any]) -> SpeechServiceManage
         local_service = LocalWhisperService(
             model_name=config.get("local_whisper_model", "base"),
             device=config.get("device_type"),
+            compute_type=config.get("whisper_compute_type", "auto"),
             download_root=config.get("whisper_model_dir", "./models"),
-            vad_filter=config.get("whisper_vad_filter", True)
+            vad_filter=config.get("whisper_vad_filter", True),
+            vad_parameters=config.get("whisper_vad_parameters"),
+            batch_size=config.get("whisper_batch_size", 1),
+            batch_window_ms=config.get("whisper_batch_window_ms", 50)
         )
         manager.register_service("local_whisper", local_service)
     
@@ -2882,6 +2882,9 @@ WHISPER_MODEL = PersistentConfig(
 )
 
 WHISPER_MODEL_DIR = os.getenv("WHISPER_MODEL_DIR", f"{CACHE_DIR}/whisper/models")
+# faster-whisper compute type: auto, float32, float16, int8_float16, int8
+# ("auto" uses int8_float16 on CUDA and int8 on CPU)
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "auto").lower()
 WHISPER_MODEL_AUTO_UPDATE = (
     not OFFLINE_MODE
     and os.environ.get("WHISPER_MODEL_AUTO_UPDATE", "").lower() == "true"
@@ -2895,6 +2898,25 @@ WHISPER_VAD_FILTER = PersistentConfig(
 
 WHISPER_LANGUAGE = os.getenv("WHISPER_LANGUAGE", "").lower() or None
 
+# Max number of audio chunks transcribed concurrently for one request
+WHISPER_CHUNK_WORKERS = max(int(os.getenv("WHISPER_CHUNK_WORKERS", "4")), 1)
+
+# Number of CTranslate2 workers of the local faster-whisper model, i.e. how
+# many transcriptions it runs in parallel; each worker costs extra memory
+WHISPER_NUM_WORKERS = max(int(os.getenv("WHISPER_NUM_WORKERS", "1")), 1)
+
+# Batch size for batched local faster-whisper inference (1 disables batching)
+WHISPER_BATCH_SIZE = max(int(os.getenv("WHISPER_BATCH_SIZE", "1")), 1)
+
+# Limits of the on-disk transcript cache: entries older than the max age are
+# dropped, and beyond the max count the oldest entries are evicted
+TRANSCRIPT_CACHE_MAX_ENTRIES = max(
+    int(os.getenv("TRANSCRIPT_CACHE_MAX_ENTRIES", "1000")), 0
+)
+TRANSCRIPT_CACHE_MAX_AGE = max(
+    int(os.getenv("TRANSCRIPT_CACHE_MAX_AGE", str(7 * 24 * 60 * 60))), 0
+)
+
 EXTERNAL_WHISPER_URL = PersistentConfig(
     "EXTERNAL_WHISPER_URL",
     "audio.stt.external_whisper_url",
@@ -574,6 +574,11 @@ async def lifespan(app: FastAPI):
 
     asyncio.create_task(periodic_usage_pool_cleanup())
 
+    try:
+        await asyncio.to_thread(audio.preload_faster_whisper_model, app)
+    except Exception as e:
+        log.warning(f"Failed to preload the local Whisper model: {e}")
+
     yield
 
     if hasattr(app.state, "redis_task_command_listener"):
@@ -1,19 +1,25 @@
 import hashlib
+import itertools
 import json
 import logging
 import os
+import re
+import subprocess
+import threading
+import time
 import uuid
 from functools import lru_cache
 from pathlib import Path
-from pydub import AudioSegment
-from pydub.silence import split_on_silence
 from concurrent.futures import ThreadPoolExecutor
-from typing import Optional
+from dataclasses import dataclass
+from typing import BinaryIO, Optional
 
 from fnmatch import fnmatch
 import aiohttp
 import aiofiles
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import mimetypes
 
 from fastapi import (
@@ -27,8 +33,9 @@ from fastapi import (
     status,
     APIRouter,
 )
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
 
 
@@ -36,8 +43,14 @@ from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.config import (
     WHISPER_MODEL_AUTO_UPDATE,
     WHISPER_MODEL_DIR,
+    WHISPER_COMPUTE_TYPE,
     CACHE_DIR,
     WHISPER_LANGUAGE,
+    WHISPER_CHUNK_WORKERS,
+    WHISPER_NUM_WORKERS,
+    WHISPER_BATCH_SIZE,
+    TRANSCRIPT_CACHE_MAX_ENTRIES,
+    TRANSCRIPT_CACHE_MAX_AGE,
 )
 
 from open_webui.constants import ERROR_MESSAGES
@@ -59,12 +72,40 @@ MAX_FILE_SIZE = MAX_FILE_SIZE_MB * 1024 * 1024  # Convert MB to bytes
 AZURE_MAX_FILE_SIZE_MB = 200
 AZURE_MAX_FILE_SIZE = AZURE_MAX_FILE_SIZE_MB * 1024 * 1024  # Convert MB to bytes
 
+# Consecutive chunks share this much audio so words at a cut are not lost
+CHUNK_OVERLAP_MS = 1000
+# Tokens compared at each chunk seam when removing the duplicated overlap
+OVERLAP_MERGE_TOKENS = 16
+OVERLAP_MIN_MATCH = 2
+# The repeated run has to sit at the seam: it may end at most this many
+# tokens before the end of the merged text and start at most this many
+# tokens into the next chunk (words clipped at the cut)
+OVERLAP_SEAM_SLACK = 2
+
+# CJK characters are matched one by one, other scripts by word
+_CJK = "\u3040-\u30ff\u3400-\u9fff\uac00-\ud7af"
+_MERGE_TOKEN_RE = re.compile(f"[{_CJK}]|[^\\W{_CJK}]+")
+
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["AUDIO"])
 
 SPEECH_CACHE_DIR = CACHE_DIR / "audio" / "speech"
 SPEECH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
+TRANSCRIPT_CACHE_DIR = CACHE_DIR / "audio" / "transcripts"
+TRANSCRIPT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+
+# Shared connection pool so repeated STT/TTS calls reuse TCP/TLS connections
+STT_REQUEST_TIMEOUT = (5, 600)  # (connect, read) seconds
+
+http_session = requests.Session()
+_http_adapter = HTTPAdapter(
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=(502, 503, 504)),
+)
+http_session.mount("http://", _http_adapter)
+http_session.mount("https://", _http_adapter)
+
 
 ##########################################
 #
@@ -72,22 +113,65 @@ SPEECH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
 #
 ##########################################
 
-from pydub import AudioSegment
-from pydub.utils import mediainfo
+
+@dataclass(slots=True)
+class AudioJob:
+    """
+    An audio file moving through the conversion/splitting pipeline, with the
+    path components and stat fields computed once instead of per step.
+    """
+
+    path: str
+    base: str
+    ext: str
+    size: int
+
+    @classmethod
+    def from_path(cls, path: str) -> "AudioJob":
+        base, ext = os.path.splitext(path)
+        return cls(path, base, ext.lower(), os.stat(path).st_size)
+
+
+def probe_media(file_path):
+    """
+    Return the codec fields of the first audio stream. Only the codec is
+    needed, so ffprobe reads just the first 32 KB instead of analysing several
+    MB like pydub's mediainfo.
+    """
+    from pydub.utils import get_prober_name
+
+    r = subprocess.run(
+        [
+            get_prober_name(),
+            "-v",
+            "error",
+            "-probesize",
+            "32768",
+            "-analyzeduration",
+            "0",
+            "-select_streams",
+            "a:0",
+            "-show_entries",
+            "stream=codec_name,codec_type,codec_tag_string",
+            "-of",
+            "json",
+            file_path,
+        ],
+        capture_output=True,
+        check=True,
+    )
+    streams = json.loads(r.stdout).get("streams") or [{}]
+    return streams[0]
 
 
-def is_audio_conversion_required(file_path):
+def is_audio_conversion_required(job: AudioJob):
     """
     Check if the given audio file needs conversion to mp3.
     """
     SUPPORTED_FORMATS = {"flac", "m4a", "mp3", "mp4", "mpeg", "wav", "webm"}
 
-    if not os.path.isfile(file_path):
-        log.error(f"File not found: {file_path}")
-        return False
-
     try:
-        info = mediainfo(file_path)
+        info = probe_media(job.path)
         codec_name = info.get("codec_name", "").lower()
         codec_type = info.get("codec_type", "").lower()
         codec_tag_string = info.get("codec_tag_string", "").lower()
@@ -106,14 +190,32 @@ def is_audio_conversion_required(file_path):
         return False
 
 
-def convert_audio_to_mp3(file_path):
-    """Convert audio file to mp3 format."""
+def run_ffmpeg(*args):
+    """Run ffmpeg (the binary pydub is configured with), raising on failure."""
+    from pydub import AudioSegment
+
+    subprocess.run(
+        [AudioSegment.converter, "-y", "-nostdin", "-loglevel", "error", *args],
+        check=True,
+        capture_output=True,
+    )
+
+
+def convert_audio_to_mp3(job: AudioJob):
+    """Convert audio file to mp3 format, returning the job for the new file."""
     try:
-        output_path = os.path.splitext(file_path)[0] + ".mp3"
-        audio = AudioSegment.from_file(file_path)
-        audio.export(output_path, format="mp3")
-        log.info(f"Converted {file_path} to {output_path}")
-        return output_path
+        output_path = job.base + ".mp3"
+        if job.ext == ".mp3":
+            # ffmpeg cannot read and write the same file in place
+            output_path = job.base + "_converted.mp3"
+        # Transcode in a single ffmpeg pass instead of decoding to PCM through
+        # pydub and spawning a second ffmpeg to re-encode it
+        run_ffmpeg("-i", job.path, "-vn", "-f", "mp3", output_path)
+        log.info(f"Converted {job.path} to {output_path}")
+        return AudioJob.from_path(output_path)
+    except subprocess.CalledProcessError as e:
+        log.error(f"Error converting audio file: {e.stderr.decode(errors='ignore')}")
+        return None
     except Exception as e:
         log.error(f"Error converting audio file: {e}")
         return None
@@ -124,12 +226,30 @@ def set_faster_whisper_model(model: str, auto_update: bool = False):
     if model:
         from faster_whisper import WhisperModel
 
+        device = DEVICE_TYPE if DEVICE_TYPE and DEVICE_TYPE == "cuda" else "cpu"
+        compute_type = WHISPER_COMPUTE_TYPE
+        if compute_type == "auto":
+            # int8 weights with fp16 activations use tensor cores on GPU
+            compute_type = "int8_float16" if device == "cuda" else "int8"
+
+        device_index = 0
+        if device == "cuda":
+            import ctranslate2
+
+            # Load one replica per visible GPU; CTranslate2 dispatches
+            # concurrent transcribe() calls to whichever replica is free
+            device_index = list(range(ctranslate2.get_cuda_device_count())) or 0
+
         faster_whisper_kwargs = {
             "model_size_or_path": model,
-            "device": DEVICE_TYPE if DEVICE_TYPE and DEVICE_TYPE == "cuda" else "cpu",
-            "compute_type": "int8",
+            "device": device,
+            "device_index": device_index,
+            "compute_type": compute_type,
             "download_root": WHISPER_MODEL_DIR,
             "local_files_only": not auto_update,
+            # Parallel transcribe() calls per device, configured separately
+            # from the remote-engine chunk thread pool
+            "num_workers": WHISPER_NUM_WORKERS,
         }
 
         try:
@@ -143,6 +263,46 @@ def set_faster_whisper_model(model: str, auto_update: bool = False):
     return whisper_model
 
 
+_faster_whisper_model_lock = threading.Lock()
+
+
+def get_faster_whisper_model(app):
+    """
+    Return the shared local model, loading it on first use. The lock keeps
+    concurrent chunk workers from each loading their own copy.
+    """
+    if app.state.faster_whisper_model is None:
+        with _faster_whisper_model_lock:
+            if app.state.faster_whisper_model is None:
+                app.state.faster_whisper_model = set_faster_whisper_model(
+                    app.state.config.WHISPER_MODEL
+                )
+    return app.state.faster_whisper_model
+
+
+def preload_faster_whisper_model(app):
+    """
+    Load the local model at startup and run one short dummy transcription so
+    model loading and CUDA/kernel initialisation are not paid by the first
+    user request.
+    """
+    if app.state.config.STT_ENGINE != "":
+        return
+
+    model = get_faster_whisper_model(app)
+    if model is None:
+        return
+
+    import numpy as np
+
+    segments, _ = model.transcribe(
+        np.zeros(16000, dtype=np.float32), beam_size=1, vad_filter=False
+    )
+    for _ in segments:
+        pass
+    log.info("Local Whisper model loaded and warmed up")
+
+
 ##########################################
 #
 # Audio API
@@ -244,6 +404,7 @@ async def update_audio_config(
         form_data.stt.SUPPORTED_CONTENT_TYPES
     )
 
+    previous_whisper_model = request.app.state.config.WHISPER_MODEL
     request.app.state.config.WHISPER_MODEL = form_data.stt.WHISPER_MODEL
     request.app.state.config.DEEPGRAM_API_KEY = form_data.stt.DEEPGRAM_API_KEY
     request.app.state.config.AUDIO_STT_AZURE_API_KEY = form_data.stt.AZURE_API_KEY
@@ -256,9 +417,15 @@ async def update_audio_config(
     request.app.state.config.EXTERNAL_WHISPER_URL = form_data.stt.EXTERNAL_WHISPER_URL
 
     if request.app.state.config.STT_ENGINE == "":
-        request.app.state.faster_whisper_model = set_faster_whisper_model(
-            form_data.stt.WHISPER_MODEL, WHISPER_MODEL_AUTO_UPDATE
-        )
+        # Only reload the local model when it actually changed; saving unrelated
+        # audio settings should not pay for a full model load
+        if (
+            request.app.state.faster_whisper_model is None
+            or previous_whisper_model != form_data.stt.WHISPER_MODEL
+        ):
+            request.app.state.faster_whisper_model = set_faster_whisper_model(
+                form_data.stt.WHISPER_MODEL, WHISPER_MODEL_AUTO_UPDATE
+            )
     else:
         request.app.state.faster_whisper_model = None
 
@@ -540,7 +707,7 @@ async def speech(request: Request, user=Depends(get_verified_user)):
         return FileResponse(file_path)
 
 
-def transcription_handler(request, file_path, metadata):
+def transcription_handler(request, file_path, metadata, audio=None):
     filename = os.path.basename(file_path)
     file_dir = os.path.dirname(file_path)
     id = filename.split(".")[0]
@@ -548,24 +715,35 @@ def transcription_handler(request, file_path, metadata):
     metadata = metadata or {}
 
     if request.app.state.config.STT_ENGINE == "":
-        if request.app.state.faster_whisper_model is None:
-            request.app.state.faster_whisper_model = set_faster_whisper_model(
-                request.app.state.config.WHISPER_MODEL
+        model = get_faster_whisper_model(request.app)
+        # An in-memory upload can be decoded directly instead of the file
+        audio_input = file_path if audio is None else audio
+        if WHISPER_BATCH_SIZE > 1:
+            from faster_whisper import BatchedInferencePipeline
+
+            # Decode the VAD-split segments of the file in batches on one
+            # encoder/decoder call instead of one 30s window at a time. The
+            # batched pipeline needs VAD to find segment boundaries.
+            segments, info = BatchedInferencePipeline(model).transcribe(
+                audio_input,
+                beam_size=5,
+                batch_size=WHISPER_BATCH_SIZE,
+                vad_filter=True,
+                language=metadata.get("language") or WHISPER_LANGUAGE,
+            )
+        else:
+            segments, info = model.transcribe(
+                audio_input,
+                beam_size=5,
+                vad_filter=request.app.state.config.WHISPER_VAD_FILTER,
+                language=metadata.get("language") or WHISPER_LANGUAGE,
             )
-
-        model = request.app.state.faster_whisper_model
-        segments, info = model.transcribe(
-            file_path,
-            beam_size=5,
-            vad_filter=request.app.state.config.WHISPER_VAD_FILTER,
-            language=metadata.get("language") or WHISPER_LANGUAGE,
-        )
         log.info(
             "Detected language '%s' with probability %f"
             % (info.language, info.language_probability)
         )
 
-        transcript = "".join([segment.text for segment in list(segments)])
+        transcript = "".join(segment.text for segment in segments)
         data = {"text": transcript.strip()}
 
         # save the transcript to a json file
@@ -590,10 +768,11 @@ def transcription_handler(request, file_path, metadata):
                 if metadata and metadata.get("language"):
                     data["language"] = metadata.get("language")
                 
-                r = requests.post(
+                r = http_session.post(
                     f"{external_whisper_url}/transcribe",
                     files=files,
-                    data=data
+                    data=data,
+                    timeout=STT_REQUEST_TIMEOUT,
                 )
                 
                 r.raise_for_status()
@@ -620,7 +799,7 @@ def transcription_handler(request, file_path, metadata):
     elif request.app.state.config.STT_ENGINE == "openai":
         r = None
         try:
-            r = requests.post(
+            r = http_session.post(
                 url=f"{request.app.state.config.STT_OPENAI_API_BASE_URL}/audio/transcriptions",
                 headers={
                     "Authorization": f"Bearer {request.app.state.config.STT_OPENAI_API_KEY}"
@@ -634,6 +813,7 @@ def transcription_handler(request, file_path, metadata):
                         else {}
                     ),
                 },
+                timeout=STT_REQUEST_TIMEOUT,
             )
 
             r.raise_for_status()
@@ -682,11 +862,12 @@ def transcription_handler(request, file_path, metadata):
                 params["model"] = request.app.state.config.STT_MODEL
 
             # Make request to Deepgram API
-            r = requests.post(
+            r = http_session.post(
                 "https://api.deepgram.com/v1/listen?smart_format=true",
                 headers=headers,
                 params=params,
                 data=file_data,
+                timeout=STT_REQUEST_TIMEOUT,
             )
             r.raise_for_status()
             response_data = r.json()
@@ -786,13 +967,14 @@ def transcription_handler(request, file_path, metadata):
 
             # Use context manager to ensure file is properly closed
             with open(file_path, "rb") as audio_file:
-                r = requests.post(
+                r = http_session.post(
                     url=url,
                     files={"audio": audio_file},
                     data=data,
                     headers={
                         "Ocp-Apim-Subscription-Key": api_key,
                     },
+                    timeout=STT_REQUEST_TIMEOUT,
                 )
 
             r.raise_for_status()
@@ -841,20 +1023,33 @@ def transcription_handler(request, file_path, metadata):
             )
 
 
-def transcribe(request: Request, file_path: str, metadata: Optional[dict] = None):
-    log.info(f"transcribe: {file_path} {metadata}")
-
-    if is_audio_conversion_required(file_path):
-        file_path = convert_audio_to_mp3(file_path)
-
-    try:
-        file_path = compress_audio(file_path)
-    except Exception as e:
-        log.exception(e)
-
-    # Always produce a list of chunk paths (could be one entry if small)
+def iter_transcription_chunks(
+    request: Request,
+    file_path: str,
+    metadata: Optional[dict] = None,
+    audio: Optional[BinaryIO] = None,
+):
+    """
+    Yield {"chunk_idx", "text"} for each chunk of the audio, in order, as soon
+    as that chunk is transcribed. The local model handles long audio itself
+    and yields a single chunk.
+    """
+    if request.app.state.config.STT_ENGINE == "":
+        # The local model decodes any format straight to 16 kHz PCM in-process
+        # and handles long audio itself; the mp3 conversion and splitting
+        # below only exist for the upload limits of remote APIs
+        result = transcription_handler(request, file_path, metadata, audio)
+        yield {"chunk_idx": 0, "text": result["text"]}
+        return
+
+    # Always produce a list of chunk paths (could be one entry if small).
+    # Oversized files are downmixed and re-encoded while being split, so
+    # there is no separate compression pass
     try:
-        chunk_paths = split_audio(file_path, MAX_FILE_SIZE)
+        job = AudioJob.from_path(file_path)
+        if is_audio_conversion_required(job):
+            job = convert_audio_to_mp3(job)
+        chunk_paths = split_audio(job, MAX_FILE_SIZE)
         print(f"Chunk paths: {chunk_paths}")
     except Exception as e:
         log.exception(e)
@@ -863,104 +1058,330 @@ def transcribe(request: Request, file_path: str, metadata: Optional[dict] = None
             detail=ERROR_MESSAGES.DEFAULT(e),
         )
 
-    results = []
     try:
-        with ThreadPoolExecutor() as executor:
+        with ThreadPoolExecutor(
+            max_workers=min(len(chunk_paths), WHISPER_CHUNK_WORKERS)
+        ) as executor:
             # Submit tasks for each chunk_path
             futures = [
                 executor.submit(transcription_handler, request, chunk_path, metadata)
                 for chunk_path in chunk_paths
             ]
-            # Gather results as they complete
-            for future in futures:
+            # Hand out results in chunk order while later chunks keep running
+            for chunk_idx, future in enumerate(futures):
                 try:
-                    results.append(future.result())
+                    result = future.result()
                 except Exception as transcribe_exc:
+                    for pending in futures:
+                        pending.cancel()
                     raise HTTPException(
                         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                         detail=f"Error transcribing chunk: {transcribe_exc}",
                     )
+                yield {"chunk_idx": chunk_idx, "text": result["text"]}
     finally:
         # Clean up only the temporary chunks, never the original file
         for chunk_path in chunk_paths:
-            if chunk_path != file_path and os.path.isfile(chunk_path):
+            if chunk_path != job.path and os.path.isfile(chunk_path):
                 try:
                     os.remove(chunk_path)
                 except Exception:
                     pass
 
+
+def transcribe(
+    request: Request,
+    file_path: str,
+    metadata: Optional[dict] = None,
+    audio: Optional[BinaryIO] = None,
+):
+    log.info(f"transcribe: {file_path} {metadata}")
+
+    if request.app.state.config.STT_ENGINE == "":
+        return transcription_handler(request, file_path, metadata, audio)
+
     return {
-        "text": " ".join([result["text"] for result in results]),
+        "text": merge_overlapping_transcripts(
+            chunk["text"]
+            for chunk in iter_transcription_chunks(request, file_path, metadata)
+        ),
     }
 
 
-def compress_audio(file_path):
-    if os.path.getsize(file_path) > MAX_FILE_SIZE:
-        id = os.path.splitext(os.path.basename(file_path))[
-            0
-        ]  # Handles names with multiple dots
-        file_dir = os.path.dirname(file_path)
+def stream_transcription(
+    request: Request,
+    file_path: str,
+    metadata: Optional[dict],
+    audio: Optional[BinaryIO],
+    transcript_cache_path: Path,
+):
+    """
+    Stream the transcript as NDJSON and cache the merged transcript once every
+    chunk is done.
+
+    Each chunk is merged into the running transcript first, and only the part
+    that later seams can no longer change is sent, as one {"chunk_idx",
+    "text"} line per chunk. A closing {"text", "done": true} line carries the
+    rest, so concatenating the "text" fields reproduces the merged transcript.
+    """
+    chunks = iter_transcription_chunks(request, file_path, metadata, audio)
+    # Run up to the first chunk before the response starts, so conversion and
+    # splitting errors are still returned as a regular HTTP error
+    first = next(chunks, None)
+
+    def generate():
+        merged = ""
+        sent = 0
+        try:
+            for chunk in itertools.chain([first] if first else [], chunks):
+                merged = merge_transcript_chunk(merged, chunk["text"])
+                final = settled_transcript_length(merged)
+                yield json.dumps(
+                    {"chunk_idx": chunk["chunk_idx"], "text": merged[sent:final]}
+                ) + "\n"
+                sent = final
+        except Exception as e:
+            log.exception(e)
+            detail = getattr(e, "detail", None) or ERROR_MESSAGES.DEFAULT(e)
+            yield json.dumps({"error": detail}) + "\n"
+            return
 
-        audio = AudioSegment.from_file(file_path)
-        audio = audio.set_frame_rate(16000).set_channels(1)  # Compress audio
+        yield json.dumps({"text": merged[sent:], "done": True}) + "\n"
 
-        compressed_path = os.path.join(file_dir, f"{id}_compressed.mp3")
-        audio.export(compressed_path, format="mp3", bitrate="32k")
-        # log.debug(f"Compressed audio to {compressed_path}")  # Uncomment if log is defined
+        write_transcript_cache(transcript_cache_path, {"text": merged})
 
-        return compressed_path
-    else:
-        return file_path
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
 
-def split_audio(file_path, max_bytes, format="mp3", bitrate="32k"):
+def _seam_tokens(text, start=0):
+    """Lower-cased merge tokens of text[start:] with their absolute spans."""
+    return [
+        (m.group().lower(), m.start(), m.end())
+        for m in _MERGE_TOKEN_RE.finditer(text, start)
+    ]
+
+
+def _seam_match(prev, head):
+    """
+    Longest run of tokens shared by prev and head that ends within
+    OVERLAP_SEAM_SLACK tokens of the end of prev and starts within
+    OVERLAP_SEAM_SLACK tokens of the start of head, as (end in prev, end in
+    head), or None. A phrase repeated further from the seam is real speech.
+    """
+    prev = [t for t, _, _ in prev]
+    head = [t for t, _, _ in head]
+    best, best_size = None, OVERLAP_MIN_MATCH - 1
+    for end in range(len(prev), max(len(prev) - OVERLAP_SEAM_SLACK, 0) - 1, -1):
+        for start in range(min(OVERLAP_SEAM_SLACK, len(head) - 1) + 1):
+            for size in range(min(end, len(head) - start), best_size, -1):
+                if prev[end - size : end] == head[start : start + size]:
+                    best, best_size = (end, start + size), size
+                    break
+    return best
+
+
+def merge_transcript_chunk(merged, text):
+    """
+    Append one chunk transcript to the merged text, dropping the words
+    repeated at the seam because of CHUNK_OVERLAP_MS. The longest run of
+    tokens shared by the end of the merged text and the start of the chunk is
+    kept only once.
+    """
+    text = text.strip()
+    if not text:
+        return merged
+    if not merged:
+        return text
+
+    prev = _seam_tokens(merged, max(len(merged) - 1000, 0))[-OVERLAP_MERGE_TOKENS:]
+    head = _seam_tokens(text)[:OVERLAP_MERGE_TOKENS]
+    match = _seam_match(prev, head)
+    if match:
+        prev_end, head_end = match
+        return merged[: prev[prev_end - 1][2]] + text[head[head_end - 1][2] :]
+    return f"{merged} {text}"
+
+
+def settled_transcript_length(merged):
+    """
+    Length of the prefix of the merged text that merging further chunks can
+    no longer change: a seam only ever cuts after one of the last
+    OVERLAP_SEAM_SLACK + 1 tokens.
+    """
+    prev = _seam_tokens(merged, max(len(merged) - 1000, 0))[-(OVERLAP_SEAM_SLACK + 1) :]
+    return prev[0][1] if prev else len(merged)
+
+
+def merge_overlapping_transcripts(texts):
+    """Join chunk transcripts in order, merging each seam once."""
+    merged = ""
+    for text in texts:
+        merged = merge_transcript_chunk(merged, text)
+    return merged
+
+
+def probe_duration_ms(file_path):
+    """Return the container duration in ms via ffprobe, or None if unknown."""
+    from pydub.utils import get_prober_name
+
+    r = subprocess.run(
+        [
+            get_prober_name(),
+            "-v",
+            "error",
+            "-show_entries",
+            "format=duration",
+            "-of",
+            "default=noprint_wrappers=1:nokey=1",
+            file_path,
+        ],
+        capture_output=True,
+        text=True,
+    )
+    try:
+        return int(float(r.stdout.strip()) * 1000)
+    except ValueError:
+        return None
+
+
+def split_audio(job: AudioJob, max_bytes, format="mp3", bitrate="32k"):
     """
     Splits audio into chunks not exceeding max_bytes.
     Returns a list of chunk file paths. If audio fits, returns list with original path.
     """
-    file_size = os.path.getsize(file_path)
-    if file_size <= max_bytes:
-        return [file_path]  # Nothing to split
+    if job.size <= max_bytes:
+        return [job.path]  # Nothing to split
 
-    audio = AudioSegment.from_file(file_path)
-    duration_ms = len(audio)
-    orig_size = file_size
+    duration_ms = probe_duration_ms(job.path)
+    if duration_ms is None:
+        from pydub import AudioSegment
 
-    approx_chunk_ms = max(int(duration_ms * (max_bytes / orig_size)) - 1000, 1000)
-    chunks = []
-    start = 0
-    i = 0
+        duration_ms = len(AudioSegment.from_file(job.path))
 
-    base, _ = os.path.splitext(file_path)
+    # Chunks are re-encoded at a constant bitrate, so their length can be
+    # computed up front (kbps == bits per ms), keeping a 5% margin for
+    # container overhead, instead of exporting and shrinking until they fit
+    bits_per_ms = int(bitrate.lower().rstrip("k"))
+    chunk_ms = max(int(max_bytes * 8 / bits_per_ms * 0.95), 2 * CHUNK_OVERLAP_MS + 1000)
 
+    # Each chunk starts slightly before the previous one ended; the
+    # duplicated words are removed again by merge_overlapping_transcripts
+    bounds = []
+    start = 0
     while start < duration_ms:
-        end = min(start + approx_chunk_ms, duration_ms)
-        chunk = audio[start:end]
-        chunk_path = f"{base}_chunk_{i}.{format}"
-        chunk.export(chunk_path, format=format, bitrate=bitrate)
+        end = min(start + chunk_ms, duration_ms)
+        bounds.append((start, end))
+        if end < duration_ms and end - start > 2 * CHUNK_OVERLAP_MS:
+            start = end - CHUNK_OVERLAP_MS
+        else:
+            start = end
+
+    chunks = [f"{job.base}_chunk_{i}.{format}" for i in range(len(bounds))]
+
+    # Encode all chunks (16 kHz mono) in one ffmpeg process with one output
+    # per chunk, so the input is decoded once instead of sliced and exported
+    # from Python.
+    # (The segment muxer cannot produce the overlapping chunks.)
+    args = ["-i", job.path]
+    for (start, end), chunk_path in zip(bounds, chunks):
+        args += [
+            "-map",
+            "0:a:0",
+            "-ss",
+            f"{start / 1000:.3f}",
+            "-t",
+            f"{(end - start) / 1000:.3f}",
+            "-ac",
+            "1",
+            "-ar",
+            "16000",
+            "-b:a",
+            bitrate,
+            "-f",
+            format,
+            chunk_path,
+        ]
+    run_ffmpeg(*args)
 
-        # Reduce chunk duration if still too large
-        while os.path.getsize(chunk_path) > max_bytes and (end - start) > 5000:
-            end = start + ((end - start) // 2)
-            chunk = audio[start:end]
-            chunk.export(chunk_path, format=format, bitrate=bitrate)
+    if any(os.path.getsize(chunk_path) > max_bytes for chunk_path in chunks):
+        for chunk_path in chunks:
+            if os.path.isfile(chunk_path):
+                os.remove(chunk_path)
+        raise Exception("Audio chunk cannot be reduced below max file size.")
 
-        if os.path.getsize(chunk_path) > max_bytes:
-            os.remove(chunk_path)
-            raise Exception("Audio chunk cannot be reduced below max file size.")
+    return chunks
 
-        chunks.append(chunk_path)
-        start = end
-        i += 1
 
-    return chunks
+def transcript_cache_settings(request, language):
+    """
+    Everything besides the audio that changes the transcript, serialized with
+    separators so different configurations can never produce the same key.
+    """
+    config = request.app.state.config
+    return json.dumps(
+        [
+            config.STT_ENGINE,
+            config.STT_MODEL,
+            config.STT_OPENAI_API_BASE_URL,
+            config.EXTERNAL_WHISPER_URL,
+            config.AUDIO_STT_AZURE_LOCALES,
+            config.AUDIO_STT_AZURE_MAX_SPEAKERS,
+            config.WHISPER_MODEL,
+            config.WHISPER_VAD_FILTER,
+            WHISPER_COMPUTE_TYPE,
+            WHISPER_BATCH_SIZE,
+            WHISPER_LANGUAGE,
+            language,
+        ]
+    ).encode("utf-8")
+
+
+def read_transcript_cache(cache_path):
+    """Return the cached transcript, or None if missing or expired."""
+    try:
+        if time.time() - cache_path.stat().st_mtime > TRANSCRIPT_CACHE_MAX_AGE:
+            return None
+        with open(cache_path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_transcript_cache(cache_path, result):
+    """Cache a transcript, then evict expired and surplus entries."""
+    if TRANSCRIPT_CACHE_MAX_ENTRIES == 0:
+        return
+    with open(cache_path, "w") as f:
+        json.dump(result, f)
+
+    cutoff = time.time() - TRANSCRIPT_CACHE_MAX_AGE
+    entries = []
+    for entry in os.scandir(TRANSCRIPT_CACHE_DIR):
+        try:
+            if entry.name.endswith(".json"):
+                mtime = entry.stat().st_mtime
+                if mtime < cutoff:
+                    os.remove(entry.path)
+                elif entry.path != str(cache_path):
+                    entries.append((mtime, entry.path))
+        except OSError:
+            pass
+
+    entries.sort()
+    # The entry just written is kept and counts towards the limit
+    for _, path in entries[: max(len(entries) + 1 - TRANSCRIPT_CACHE_MAX_ENTRIES, 0)]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
 
 
 @router.post("/transcriptions")
-def transcription(
+async def transcription(
     request: Request,
     file: UploadFile = File(...),
     language: Optional[str] = Form(None),
+    stream: bool = Form(False),
     user=Depends(get_verified_user),
 ):
     log.info(f"file.content_type: {file.content_type}")
@@ -984,14 +1405,47 @@ def transcription(
         id = uuid.uuid4()
 
         filename = f"{id}.{ext}"
-        contents = file.file.read()
 
         file_dir = f"{CACHE_DIR}/audio/transcriptions"
         os.makedirs(file_dir, exist_ok=True)
         file_path = f"{file_dir}/{filename}"
 
-        with open(file_path, "wb") as f:
-            f.write(contents)
+        # Hash the upload while reading it so repeated uploads can be served
+        # from the transcript cache
+        hasher = hashlib.blake2b(digest_size=16)
+        audio = None
+        if request.app.state.config.STT_ENGINE == "":
+            # The local model decodes the spooled upload directly, so it is
+            # never written to and read back from the cache directory
+            audio = file.file
+            while chunk := await file.read(1 << 20):
+                hasher.update(chunk)
+            await file.seek(0)
+        else:
+            # Copy in 1 MB chunks instead of holding the whole upload in memory,
+            # without blocking the event loop on the file I/O
+            async with aiofiles.open(file_path, "wb") as f:
+                while chunk := await file.read(1 << 20):
+                    hasher.update(chunk)
+                    await f.write(chunk)
+
+        hasher.update(b"\0" + transcript_cache_settings(request, language))
+        transcript_cache_path = TRANSCRIPT_CACHE_DIR.joinpath(
+            f"{hasher.hexdigest()}.json"
+        )
+
+        # Check if the transcript already exists in the cache
+        result = await run_in_threadpool(read_transcript_cache, transcript_cache_path)
+        if result is not None:
+            if stream:
+                return StreamingResponse(
+                    iter([json.dumps({"text": result["text"], "done": True}) + "\n"]),
+                    media_type="application/x-ndjson",
+                )
+            return {
+                **result,
+                "filename": os.path.basename(file_path),
+            }
 
         try:
             metadata = None
@@ -999,7 +1453,25 @@ def transcription(
             if language:
                 metadata = {"language": language}
 
-            result = transcribe(request, file_path, metadata)
+            # Transcription is blocking (model inference, ffmpeg, remote
+            # APIs), so it runs in the threadpool
+            if stream:
+                return await run_in_threadpool(
+                    stream_transcription,
+                    request,
+                    file_path,
+                    metadata,
+                    audio,
+                    transcript_cache_path,
+                )
+
+            result = await run_in_threadpool(
+                transcribe, request, file_path, metadata, audio
+            )
+
+            await run_in_threadpool(
+                write_transcript_cache, transcript_cache_path, result
+            )
 
             return {
                 **result,
@@ -1031,7 +1503,7 @@ def get_available_models(request: Request) -> list[dict]:
             "https://api.openai.com"
         ):
             try:
-                response = requests.get(
+                response = http_session.get(
                     f"{request.app.state.config.TTS_OPENAI_API_BASE_URL}/audio/models"
                 )
                 response.raise_for_status()
@@ -1044,7 +1516,7 @@ def get_available_models(request: Request) -> list[dict]:
             available_models = [{"id": "tts-1"}, {"id": "tts-1-hd"}]
     elif request.app.state.config.TTS_ENGINE == "elevenlabs":
         try:
-            response = requests.get(
+            response = http_session.get(
                 "https://api.elevenlabs.io/v1/models",
                 headers={
                     "xi-api-key": request.app.state.config.TTS_API_KEY,
@@ -1077,7 +1549,7 @@ def get_available_voices(request) -> dict:
             "https://api.openai.com"
         ):
             try:
-                response = requests.get(
+                response = http_session.get(
                     f"{request.app.state.config.TTS_OPENAI_API_BASE_URL}/audio/voices"
                 )
                 response.raise_for_status()
@@ -1122,7 +1594,7 @@ def get_available_voices(request) -> dict:
                 "Ocp-Apim-Subscription-Key": request.app.state.config.TTS_API_KEY
             }
 
-            response = requests.get(url, headers=headers)
+            response = http_session.get(url, headers=headers)
             response.raise_for_status()
             voices = response.json()
 
@@ -1148,7 +1620,7 @@ def get_elevenlabs_voices(api_key: str) -> dict:
 
     try:
         # TODO: Add retries
-        response = requests.get(
+        response = http_session.get(
             "https://api.elevenlabs.io/v1/voices",
             headers={
                 "xi-api-key": api_key,
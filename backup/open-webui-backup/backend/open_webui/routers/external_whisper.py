@@ -2,7 +2,6 @@
 # 将此文件保存为 open-webui/backend/open_webui/routers/external_whisper.py
 
 import logging
-import os
 import uuid
 import aiohttp
 import json
@@ -12,12 +11,14 @@ from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, Uplo
 from fastapi.responses import JSONResponse
 
 from open_webui.utils.auth import get_verified_user
-from open_webui.config import CACHE_DIR
 
 router = APIRouter()
 
 log = logging.getLogger(__name__)
 
+# 上传文件转发的分块大小
+CHUNK_SIZE = 1 << 20
+
 @router.post("/transcriptions")
 async def transcription(
     request: Request,
@@ -29,24 +30,20 @@ async def transcription(
     将音频转录请求代理到外部Whisper服务
     """
     try:
-        # 保存上传的文件
         ext = file.filename.split(".")[-1]
         id = uuid.uuid4()
         filename = f"{id}.{ext}"
         
-        file_dir = f"{CACHE_DIR}/audio/transcriptions"
-        os.makedirs(file_dir, exist_ok=True)
-        file_path = f"{file_dir}/{filename}"
-        
-        contents = await file.read()
-        with open(file_path, "wb") as f:
-            f.write(contents)
+        async def file_sender():
+            # 直接把上传内容分块转发给Whisper服务，不再先落盘再读回
+            while chunk := await file.read(CHUNK_SIZE):
+                yield chunk
         
-        # 准备发送到Whisper服务的请求
+        # 准备发送到Whisper服务的请求，文件内容流式发送
         form_data = aiohttp.FormData()
         form_data.add_field(
             'file',
-            open(file_path, 'rb'),
+            file_sender(),
             filename=filename,
             content_type=file.content_type
         )
@@ -73,7 +70,7 @@ async def transcription(
                 result = await response.json()
                 return {
                     **result,
-                    "filename": os.path.basename(file_path),
+                    "filename": filename,
                 }
     
     except Exception as e:
@@ -81,4 +78,4 @@ async def transcription(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"处理转录请求时出错: {str(e)}"
-        )
\ No newline at end of file
+        )
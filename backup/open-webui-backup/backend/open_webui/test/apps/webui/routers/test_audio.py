@@ -0,0 +1,69 @@
+from open_webui.routers.audio import (
+    merge_overlapping_transcripts,
+    merge_transcript_chunk,
+)
+
+
+def test_merge_drops_repeated_seam_words():
+    merged = merge_overlapping_transcripts(
+        ["the quick brown fox", "brown fox jumps over", "jumps over the lazy dog"]
+    )
+    assert merged == "the quick brown fox jumps over the lazy dog"
+
+
+def test_merge_long_transcript():
+    # The seam is searched in the last 1000 characters only, so the cut
+    # point has to be placed correctly in texts longer than that
+    prefix = " ".join(f"word{i}" for i in range(300))
+    assert len(prefix) > 1000
+
+    merged = merge_overlapping_transcripts(
+        [f"{prefix} the quick brown fox", "brown fox um jumps"]
+    )
+    assert merged == f"{prefix} the quick brown fox um jumps"
+
+    merged = merge_overlapping_transcripts(
+        [f"{prefix} the quick brown fox", "quick brown fox jumps"]
+    )
+    assert merged == f"{prefix} the quick brown fox jumps"
+
+
+def test_merge_without_overlap_joins_with_space():
+    assert merge_overlapping_transcripts(["hello there", "general kenobi"]) == (
+        "hello there general kenobi"
+    )
+
+
+def test_merge_skips_empty_chunks():
+    assert merge_overlapping_transcripts(["", "  hello world ", ""]) == "hello world"
+    assert merge_transcript_chunk("hello world", "   ") == "hello world"
+
+
+def test_merge_cjk_characters():
+    assert merge_overlapping_transcripts(["今天天气很好", "天气很好我们去公园"]) == (
+        "今天天气很好我们去公园"
+    )
+
+
+def test_merge_keeps_phrase_repeated_away_from_seam():
+    # "thank you very much" also occurs earlier in the previous chunk, but
+    # only the "thank you" at its end is the audio overlap
+    merged = merge_overlapping_transcripts(
+        [
+            "I said thank you very much and then he said thank you",
+            "thank you very much for coming",
+        ]
+    )
+    assert merged == (
+        "I said thank you very much and then he said thank you very much for coming"
+    )
+
+
+def test_merge_tolerates_clipped_words_at_seam():
+    merged = merge_overlapping_transcripts(
+        [
+            "we went to the market yesterday morning it ra",
+            "ing yesterday morning it rained",
+        ]
+    )
+    assert merged == "we went to the market yesterday morning it rained"
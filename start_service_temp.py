@@ -8,7 +8,11 @@ import logging
 import subprocess
 import time
 import signal
+import select
 import shutil
+import importlib.util
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # 配置日志
@@ -19,54 +23,111 @@ logging.basicConfig(
 )
 log = logging.getLogger("start_service")
 
-def check_dependencies():
-    """检查依赖是否已安装"""
+# 必需的模块及其对应的pip包名
+REQUIRED_PACKAGES = {
+    "faster_whisper": "faster-whisper",
+    "fastapi": "fastapi",
+    "uvicorn": "uvicorn",
+}
+REQUIREMENTS_FILE = Path("requirements.txt")
+# 依赖检查通过的标记文件，内容为requirements.txt的修改时间
+DEPS_SENTINEL = Path("cache/.deps_ok")
+
+# 需要创建的目录，以及目录创建完成后的标记文件
+REQUIRED_DIRS = ("cache/audio/transcriptions", "models")
+DIRS_SENTINEL = Path("cache/.initialized")
+
+def _requirements_stamp():
+    """依赖检查标记的内容：requirements.txt的修改时间"""
+    return str(REQUIREMENTS_FILE.stat().st_mtime_ns) if REQUIREMENTS_FILE.exists() else ""
+
+def dependencies_verified():
+    """requirements.txt未变化且上次依赖检查已通过时返回True"""
     try:
-        import faster_whisper
-        import torch
-        import fastapi
-        import uvicorn
-    except ImportError as e:
-        log.error(f"缺少依赖: {e}")
+        return DEPS_SENTINEL.read_text() == _requirements_stamp()
+    except OSError:
+        return False
+
+def check_dependencies():
+    """检查依赖是否已安装，只安装缺少的包"""
+    if dependencies_verified():
+        return True
+    stamp = _requirements_stamp()
+    
+    # 只查找模块是否存在，不实际导入
+    missing = [
+        package for module, package in REQUIRED_PACKAGES.items()
+        if importlib.util.find_spec(module) is None
+    ]
+    if missing:
+        log.error(f"缺少依赖: {', '.join(missing)}")
         log.info("正在尝试安装依赖...")
         
-        pip_cmd = [sys.executable, "-m", "pip", "install", "-r", "requirements.txt"]
+        pip_cmd = [sys.executable, "-m", "pip", "install", "--prefer-binary", *missing]
         try:
             subprocess.run(pip_cmd, check=True)
+            importlib.invalidate_caches()
             log.info("依赖安装完成")
         except subprocess.CalledProcessError:
             log.error("依赖安装失败，请手动运行: pip install -r requirements.txt")
             return False
     
+    try:
+        DEPS_SENTINEL.parent.mkdir(parents=True, exist_ok=True)
+        DEPS_SENTINEL.write_text(stamp)
+    except OSError as e:
+        log.debug(f"写入依赖检查标记失败: {e}")
+    
     return True
 
+@lru_cache(maxsize=1)
+def find_ffmpeg():
+    """查找ffmpeg路径，优先使用FFMPEG_BIN环境变量，避免重复扫描PATH"""
+    return os.environ.get("FFMPEG_BIN") or shutil.which('ffmpeg')
+
 def check_ffmpeg():
     """检查ffmpeg是否已安装"""
-    if shutil.which('ffmpeg') is None:
+    ffmpeg_path = find_ffmpeg()
+    if ffmpeg_path is None:
         log.error("未找到ffmpeg，音频处理可能会受影响")
         log.info("请安装ffmpeg: https://ffmpeg.org/download.html")
         return False
+    # 导出检测到的路径，服务进程直接使用，无需再次查找
+    os.environ["FFMPEG_BIN"] = ffmpeg_path
     return True
 
 def create_directories():
-    """创建必要的目录"""
-    Path("cache/audio/transcriptions").mkdir(parents=True, exist_ok=True)
-    Path("models").mkdir(parents=True, exist_ok=True)
+    """创建必要的目录，已初始化过时只需一次stat即可跳过"""
+    if DIRS_SENTINEL.exists():
+        return
+    
+    for directory in REQUIRED_DIRS:
+        if not os.path.isdir(directory):
+            os.makedirs(directory, exist_ok=True)
+    DIRS_SENTINEL.touch()
     log.info("已创建必要的目录")
 
+@lru_cache(maxsize=1)
 def detect_gpu():
-    """检测GPU是否可用"""
+    """
+    通过CTranslate2检测GPU是否可用，结果缓存；已设置DEVICE_TYPE时直接使用
+    
+    与服务使用同一个推理后端检测，无需导入torch
+    """
+    device_type = os.environ.get("DEVICE_TYPE")
+    if device_type:
+        return device_type == "cuda"
+    
     try:
-        import torch
-        if torch.cuda.is_available():
-            device_count = torch.cuda.device_count()
-            device_name = torch.cuda.get_device_name(0) if device_count > 0 else "Unknown"
-            log.info(f"检测到GPU: {device_name} (共 {device_count} 个设备)")
+        import ctranslate2
+        device_count = ctranslate2.get_cuda_device_count()
+        if device_count > 0:
+            log.info(f"检测到GPU (共 {device_count} 个设备)")
             return True
         else:
             log.warning("未检测到GPU，将使用CPU模式")
             return False
-    except:
+    except Exception:
         log.warning("检测GPU时出错，将使用CPU模式")
         return False
 
@@ -83,6 +144,35 @@ def load_environment_variables(env_file=".env"):
     except ImportError:
         log.warning("python-dotenv未安装，无法加载.env文件")
 
+def wait_process(process, timeout=None):
+    """等待子进程退出，超时返回False；支持pidfd时（Linux 5.3+）通过poll事件等待"""
+    try:
+        pidfd = os.pidfd_open(process.pid)
+    except (AttributeError, OSError):
+        try:
+            process.wait(timeout=timeout)
+            return True
+        except subprocess.TimeoutExpired:
+            return False
+    
+    try:
+        poller = select.poll()
+        poller.register(pidfd, select.POLLIN)
+        if not poller.poll(None if timeout is None else int(timeout * 1000)):
+            return False
+    finally:
+        os.close(pidfd)
+    process.wait()
+    return True
+
+def stop_process(process, timeout=2):
+    """先发送SIGTERM，超时后再强制结束子进程"""
+    process.terminate()
+    if not wait_process(process, timeout=timeout):
+        log.warning(f"服务未在{timeout}秒内退出，强制终止")
+        process.kill()
+        process.wait()
+
 def start_service(port=8000, host="0.0.0.0", reload=False):
     """启动Whisper API服务"""
     if not os.environ.get("DEVICE_TYPE"):
@@ -98,28 +188,31 @@ def start_service(port=8000, host="0.0.0.0", reload=False):
     if port != 8000:
         os.environ["PORT"] = str(port)
     
-    try:
-        process = subprocess.Popen(cmd)
-        
-        def signal_handler(sig, frame):
-            log.info("正在停止服务...")
-            process.terminate()
-            process.wait(timeout=5)
-            log.info("服务已停止")
-            sys.exit(0)
-        
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
-        
-        process.wait()
-    except KeyboardInterrupt:
-        log.info("接收到中断信号，正在停止服务...")
-        process.terminate()
+    # 不需要监督子进程时直接用服务进程替换当前进程，省去一个空等的Python解释器，
+    # 信号也直接送达服务进程，无需转发
+    if not reload and os.name == "posix":
         try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
+            os.execv(sys.executable, cmd)
+        except OSError as e:
+            log.error(f"启动服务时出错: {e}")
+            return False
+    
+    process = None
+    
+    def signal_handler(sig, frame):
+        log.info("正在停止服务...")
+        if process is not None and process.poll() is None:
+            stop_process(process)
         log.info("服务已停止")
+        sys.exit(0)
+    
+    # 在启动子进程之前安装信号处理，避免启动期间收到SIGTERM时直接被默认处理终止
+    signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
+    
+    try:
+        process = subprocess.Popen(cmd)
+        wait_process(process)
     except Exception as e:
         log.error(f"启动服务时出错: {e}")
         return False
@@ -165,17 +258,7 @@ def main():
     
     args = parser.parse_args()
     
-    # 检查依赖
-    if not check_dependencies():
-        return 1
-    
-    # 检查ffmpeg
-    check_ffmpeg()
-    
-    # 创建必要的目录
-    create_directories()
-    
-    # 加载环境变量
+    # 先加载环境变量，.env或命令行指定了DEVICE_TYPE时无需再检测GPU
     load_environment_variables(args.env)
     
     # 设置命令行参数指定的环境变量
@@ -187,6 +270,22 @@ def main():
         os.environ["DEVICE_TYPE"] = args.device
         log.info(f"使用设备: {args.device}")
     
+    # 依赖检查、ffmpeg检查、目录创建互不依赖，并行执行
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        deps_future = executor.submit(check_dependencies)
+        ffmpeg_future = executor.submit(check_ffmpeg)
+        dirs_future = executor.submit(create_directories)
+    
+    ffmpeg_future.result()
+    dirs_future.result()
+    if not deps_future.result():
+        return 1
+    
+    # ctranslate2随faster-whisper安装，依赖检查（可能的安装）完成后再检测GPU；
+    # 缓存检测结果，start_service不再重复检测
+    if not os.environ.get("DEVICE_TYPE"):
+        os.environ["DEVICE_TYPE"] = "cuda" if detect_gpu() else "cpu"
+    
     # 启动服务
     success = start_service(port=args.port, host=args.host, reload=args.reload)
     return 0 if success else 1
@@ -1,23 +1,41 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import io
 import os
 import sys
 import logging
+import subprocess
 from typing import Optional, Dict, Any
 from pathlib import Path
-import torch
 import uuid
-import re
+from collections import OrderedDict
+from math import gcd
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    import zhconv
+except ImportError:
+    zhconv = None
+
+# 优先使用blake3计算上传内容的哈希，未安装时回退到标准库的blake2b
+try:
+    from blake3 import blake3 as content_hasher
+except ImportError:
+    from hashlib import blake2b as content_hasher
 
 from fastapi import FastAPI, File, UploadFile, Form, HTTPException, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import uvicorn
 
 # 导入语音服务模块
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from speech_service import (
     create_speech_service_manager,
+    cuda_available,
     LocalWhisperService,
     RemoteWhisperService,
 )
@@ -36,19 +54,31 @@ log = logging.getLogger("whisper_api")
 # 环境变量配置
 CACHE_DIR = os.getenv("CACHE_DIR", "./cache")
 WHISPER_MODEL = os.getenv("WHISPER_MODEL", "base")
-DEVICE_TYPE = os.getenv("DEVICE_TYPE", "cuda" if torch.cuda.is_available() else "cpu")
+DEVICE_TYPE = os.getenv("DEVICE_TYPE", "cuda" if cuda_available() else "cpu")
 WHISPER_MODEL_DIR = os.getenv("WHISPER_MODEL_DIR", "./models")
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "auto")
 WHISPER_LANGUAGE = os.getenv("WHISPER_LANGUAGE", "zh")
 WHISPER_VAD_FILTER = os.getenv("WHISPER_VAD_FILTER", "True").lower() in ("true", "1", "t")
+WHISPER_VAD_MIN_SILENCE_MS = int(os.getenv("WHISPER_VAD_MIN_SILENCE_MS", "500"))
+WHISPER_VAD_THRESHOLD = float(os.getenv("WHISPER_VAD_THRESHOLD", "0.5"))
+WHISPER_BATCH_SIZE = int(os.getenv("WHISPER_BATCH_SIZE", "1"))
+WHISPER_BATCH_WINDOW_MS = int(os.getenv("WHISPER_BATCH_WINDOW_MS", "50"))
+TRANSCRIPT_CACHE_SIZE = int(os.getenv("TRANSCRIPT_CACHE_SIZE", "512"))
+FFMPEG_BIN = os.getenv("FFMPEG_BIN")
+# 本地模型处理不超过此大小的上传时直接在内存中解码，不落盘（字节）
+IN_MEMORY_AUDIO_LIMIT = int(os.getenv("IN_MEMORY_AUDIO_LIMIT", str(64 << 20)))
 
 # 创建临时文件目录
-os.makedirs(f"{CACHE_DIR}/audio/transcriptions", exist_ok=True)
+TRANSCRIPTION_DIR = os.path.join(CACHE_DIR, "audio", "transcriptions")
+os.makedirs(TRANSCRIPTION_DIR, exist_ok=True)
 
 # 创建FastAPI应用
 app = FastAPI(
     title="Whisper API",
     description="语音识别API服务，基于OpenAI的Whisper模型",
     version="1.0.0",
+    # orjson序列化更快，且直接输出UTF-8中文而不是\uXXXX转义
+    default_response_class=ORJSONResponse,
 )
 
 # 添加CORS中间件
@@ -66,12 +96,25 @@ config = {
     "local_whisper_model": WHISPER_MODEL,
     "device_type": DEVICE_TYPE,
     "whisper_model_dir": WHISPER_MODEL_DIR,
+    "whisper_compute_type": WHISPER_COMPUTE_TYPE,
     "whisper_vad_filter": WHISPER_VAD_FILTER,
+    "whisper_vad_parameters": {
+        "min_silence_duration_ms": WHISPER_VAD_MIN_SILENCE_MS,
+        "threshold": WHISPER_VAD_THRESHOLD,
+    },
+    "whisper_batch_size": WHISPER_BATCH_SIZE,
+    "whisper_batch_window_ms": WHISPER_BATCH_WINDOW_MS,
     "default_service": "local_whisper"
 }
 
 service_manager = create_speech_service_manager(config)
 
+# 导入时并发初始化所有服务，并预热本地模型使其常驻内存，首个请求无需承担加载和CUDA初始化开销
+init_results = service_manager.initialize_all()
+local_whisper_service = service_manager.get_service("local_whisper")
+if init_results.get("local_whisper"):
+    local_whisper_service.warmup()
+
 def convert_to_simplified_chinese(text):
     """
     将文本中的繁体中文转换为简体中文
@@ -82,10 +125,11 @@ def convert_to_simplified_chinese(text):
     Returns:
         转换后的简体中文文本
     """
+    if zhconv is None:
+        log.warning("未安装zhconv库，无法进行繁简转换，请使用pip install zhconv安装")
+        return text
+    
     try:
-        # 尝试导入zhconv库
-        import zhconv
-        
         # 使用zhconv将文本转换为简体中文
         simplified_text = zhconv.convert(text, 'zh-cn')
         
@@ -94,88 +138,191 @@ def convert_to_simplified_chinese(text):
             log.info(f"已将繁体中文转换为简体中文")
             
         return simplified_text
-    except ImportError:
-        log.warning("未安装zhconv库，无法进行繁简转换，请使用pip install zhconv安装")
-        return text
     except Exception as e:
         log.warning(f"繁简转换出错: {str(e)}")
         return text
 
-def preprocess_audio(audio_path, silence_threshold=-50, min_silence_len=500):
+def decode_to_f32_mono_16k(raw_bytes):
+    """通过ffmpeg的标准输入输出管道把音频字节直接解码为16kHz单声道float32数组"""
+    process = subprocess.run(
+        [FFMPEG_BIN or "ffmpeg", "-loglevel", "error", "-i", "pipe:0",
+         "-f", "f32le", "-ac", "1", "-ar", "16000", "pipe:1"],
+        input=raw_bytes,
+        capture_output=True,
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"ffmpeg解码失败: {process.stderr.decode(errors='ignore').strip()}")
+    return np.frombuffer(process.stdout, dtype=np.float32)
+
+def _load_audio(audio):
     """
-    预处理音频：裁剪前后的静音段落，并转换为WAV格式
+    读取音频为float32数组，形状为(采样点数, 声道数)
+    
+    audio可以是文件路径或内存中的音频字节。优先使用soundfile直接解码；soundfile不支持的格式
+    （如m4a、webm）回退到ffmpeg解码：字节经管道解码，文件路径经pydub解码
+    """
+    try:
+        import soundfile as sf
+        source = io.BytesIO(audio) if isinstance(audio, bytes) else audio
+        return sf.read(source, dtype="float32", always_2d=True)
+    except Exception:
+        if isinstance(audio, bytes):
+            return decode_to_f32_mono_16k(audio)[:, None], 16000
+        
+        from pydub import AudioSegment
+        
+        # 使用启动脚本检测到的ffmpeg，与check_ffmpeg检查的是同一个可执行文件
+        if FFMPEG_BIN:
+            AudioSegment.converter = FFMPEG_BIN
+        sound = AudioSegment.from_file(audio)
+        samples = np.array(sound.get_array_of_samples(), dtype=np.float32)
+        samples = samples.reshape(-1, sound.channels) / float(1 << (8 * sound.sample_width - 1))
+        return samples, sound.frame_rate
+
+def _voiced_frame_bounds(samples, win, thresh):
+    """
+    从两端逐帧扫描，返回首个和末个非静音帧的帧区间[start, end)，全为静音时返回(-1, -1)
+    
+    找到非静音帧即停止，不需要计算整段音频的能量；安装numba时会被JIT编译为本地代码
+    """
+    n = len(samples) // win
+    start = -1
+    for i in range(n):
+        acc = 0.0
+        for j in range(i * win, (i + 1) * win):
+            acc += samples[j] * samples[j]
+        if acc >= thresh:
+            start = i
+            break
+    if start < 0:
+        return -1, -1
+    
+    end = start + 1
+    for i in range(n - 1, start, -1):
+        acc = 0.0
+        for j in range(i * win, (i + 1) * win):
+            acc += samples[j] * samples[j]
+        if acc >= thresh:
+            end = i + 1
+            break
+    return start, end
+
+try:
+    from numba import njit
+    _voiced_frame_bounds_jit = njit(cache=True, fastmath=True)(_voiced_frame_bounds)
+    # 导入时触发编译（或从缓存加载），避免首个请求承担编译开销
+    _voiced_frame_bounds_jit(np.zeros(160, dtype=np.float32), 160, 1.0)
+except ImportError:
+    _voiced_frame_bounds_jit = None
+
+def _detect_voiced_range(mono, sample_rate, silence_threshold, chunk_ms=10):
+    """
+    按chunk_ms分帧计算能量，返回首尾非静音帧对应的采样点区间[start, end)
+    
+    判定规则与pydub.silence.detect_leading_silence一致：帧的dBFS低于silence_threshold即为静音。
+    整段都是静音时返回None。
+    """
+    win = max(1, int(sample_rate * chunk_ms / 1000))
+    if len(mono) < win:
+        return None
+    
+    thresh = (10 ** (silence_threshold / 10)) * win
+    
+    if _voiced_frame_bounds_jit is not None:
+        start, end = _voiced_frame_bounds_jit(mono, win, thresh)
+        if start < 0:
+            return None
+    else:
+        frames = sliding_window_view(mono, win)[::win]
+        energy = np.einsum("ij,ij->i", frames, frames)
+        mask = energy >= thresh
+        if not mask.any():
+            return None
+        
+        start = int(np.argmax(mask))
+        end = len(mask) - int(np.argmax(mask[::-1]))
+    
+    return start * win, min(end * win, len(mono))
+
+def preprocess_audio(audio_path, silence_threshold=-50, min_silence_len=500, trim_silence=True):
+    """
+    预处理音频：转换为单声道16kHz采样数组，并可选裁剪前后的静音段落
     
     Args:
-        audio_path: 原始音频文件路径
+        audio_path: 原始音频文件路径，或内存中的音频字节
         silence_threshold: 静音检测阈值(dB)
         min_silence_len: 最小静音长度(ms)
+        trim_silence: 是否裁剪前后静音，模型已启用VAD过滤时无需重复处理
     
     Returns:
-        处理后的WAV文件路径
+        处理后的float32采样数组，可直接传给faster-whisper；处理失败时返回原始文件路径，
+        内存中的字节则包装为文件对象返回，交给faster-whisper自行解码
     """
-    log.info(f"开始预处理音频文件: {audio_path}")
+    in_memory = isinstance(audio_path, bytes)
+    log.info(f"开始预处理音频: {f'内存中{len(audio_path)}字节' if in_memory else audio_path}")
     
     try:
-        # 导入pydub库
-        from pydub import AudioSegment
-        from pydub.silence import detect_leading_silence
+        from scipy.signal import resample_poly
         
         # 加载音频文件
-        sound = AudioSegment.from_file(audio_path)
+        data, sample_rate = _load_audio(audio_path)
         
         # 获取原始音频信息
-        original_channels = sound.channels
-        original_sample_rate = sound.frame_rate
-        log.info(f"原始音频: {original_channels}声道, {original_sample_rate}Hz, 时长: {len(sound)/1000.0:.2f}秒")
+        original_channels = data.shape[1]
+        duration_before = len(data) / sample_rate  # 秒
+        log.info(f"原始音频: {original_channels}声道, {sample_rate}Hz, 时长: {duration_before:.2f}秒")
         
-        # 检测并裁剪前端静音
-        start_trim = detect_leading_silence(sound, silence_threshold=silence_threshold)
+        # 统一转换为单声道（Whisper模型的最佳输入格式）
+        mono = data.mean(axis=1) if original_channels > 1 else data[:, 0]
+        if original_channels > 1:
+            log.info(f"音频已转换为单声道")
         
-        # 反转音频检测尾部静音
-        end_trim = detect_leading_silence(sound.reverse(), silence_threshold=silence_threshold)
+        # 一次扫描同时检测前端和尾部静音并裁剪
+        trimmed = mono
+        if trim_silence:
+            voiced_range = _detect_voiced_range(mono, sample_rate, silence_threshold)
+            trimmed = mono[voiced_range[0]:voiced_range[1]] if voiced_range else mono[:0]
+            
+            # 如果裁剪后音频太短，则使用原始音频
+            if len(trimmed) < sample_rate:  # 小于1秒
+                log.warning("裁剪后音频太短，使用原始音频")
+                trimmed = mono
         
-        # 裁剪音频
-        trimmed_sound = sound[start_trim:len(sound)-end_trim]
+        duration_after = len(trimmed) / sample_rate  # 秒
         
-        # 如果裁剪后音频太短，则使用原始音频
-        if len(trimmed_sound) < 1000:  # 小于1秒
-            log.warning("裁剪后音频太短，使用原始音频")
-            trimmed_sound = sound
-            
-        # 统一转换为单声道16kHz格式（Whisper模型的最佳输入格式）
-        if trimmed_sound.channels > 1:
-            trimmed_sound = trimmed_sound.set_channels(1)
-            log.info(f"音频已转换为单声道")
-            
-        if trimmed_sound.frame_rate != 16000:
-            trimmed_sound = trimmed_sound.set_frame_rate(16000)
+        # 统一转换为16kHz采样率
+        if sample_rate != 16000:
+            factor = gcd(16000, sample_rate)
+            trimmed = resample_poly(trimmed, 16000 // factor, sample_rate // factor)
             log.info(f"音频已转换为16kHz采样率")
         
-        # 保存为WAV格式
-        output_path = f"{os.path.dirname(audio_path)}/{str(uuid.uuid4())}.wav"
-        trimmed_sound.export(output_path, format="wav")
-        
-        duration_before = len(sound) / 1000.0  # 秒
-        duration_after = len(trimmed_sound) / 1000.0  # 秒
         log.info(f"音频预处理完成: 从 {duration_before:.2f}秒 裁剪到 {duration_after:.2f}秒, mono+16kHz格式")
         
-        return output_path
+        return trimmed.astype(np.float32, copy=False)
     except Exception as e:
         log.exception(f"音频预处理失败: {str(e)}")
-        return audio_path  # 如果处理失败，返回原始文件路径
+        # 如果处理失败，返回原始音频
+        return io.BytesIO(audio_path) if in_memory else audio_path
 
 @app.on_event("startup")
 async def startup_event():
     """应用启动时执行的操作"""
     log.info("Whisper API 服务正在启动...")
     
-    # 预加载模型（可选，如果希望启动时就加载模型）
-    try:
-        service = service_manager.get_service("local_whisper")
-        service.initialize()
+    # 模型已在导入时加载，这里只检查状态
+    if local_whisper_service.model is not None:
         log.info(f"Whisper模型 {WHISPER_MODEL} 已预加载")
-    except Exception as e:
-        log.warning(f"预加载Whisper模型失败: {str(e)}")
+    else:
+        log.warning(f"Whisper模型 {WHISPER_MODEL} 预加载失败，将在首次请求时重试")
+    
+    # zhconv在首次转换时才加载转换词典，提前触发以免首个请求承担这部分开销
+    if zhconv is not None:
+        zhconv.convert("預熱", "zh-cn")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """应用关闭时释放模型和各服务的HTTP连接"""
+    await service_manager.acleanup_all()
 
 
 @app.get("/")
@@ -206,8 +353,44 @@ async def list_services():
     }
 
 
+# 转写结果缓存：(内容哈希, 服务ID, 语言) -> 结果，按LRU淘汰
+transcript_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+
+def get_cached_transcript(key: tuple) -> Optional[Dict[str, Any]]:
+    """查找缓存的转写结果，命中时标记为最近使用并返回副本"""
+    result = transcript_cache.get(key)
+    if result is None:
+        return None
+    transcript_cache.move_to_end(key)
+    return dict(result)
+
+def cache_transcript(key: tuple, result: Dict[str, Any]):
+    """缓存转写结果，超过容量时淘汰最久未使用的条目"""
+    if TRANSCRIPT_CACHE_SIZE <= 0:
+        return
+    transcript_cache[key] = dict(result)
+    transcript_cache.move_to_end(key)
+    while len(transcript_cache) > TRANSCRIPT_CACHE_SIZE:
+        transcript_cache.popitem(last=False)
+
+def save_upload(src, file_path, hasher):
+    """把上传内容按1MB分块写入磁盘，避免整个读入内存，同时计算内容哈希，返回写入的字节数"""
+    with open(file_path, "wb") as f:
+        while chunk := src.read(1 << 20):
+            hasher.update(chunk)
+            f.write(chunk)
+        return f.tell()
+
+def remove_temp_file(file_path):
+    """删除临时文件，失败时只记录警告"""
+    try:
+        os.unlink(file_path)
+    except Exception as e:
+        log.warning(f"清理临时文件时出错: {str(e)}")
+
 @app.post("/transcribe")
 async def transcribe_audio(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     language: Optional[str] = Form(None),
     service_id: Optional[str] = Form(None),
@@ -230,63 +413,91 @@ async def transcribe_audio(
         )
     
     # 保存上传的文件
+    original_file_path = None
     try:
-        file_content = await file.read()
+        service = service_manager.get_service(service_id)
         
-        # 检查文件大小和内容
-        if len(file_content) == 0:
-            raise HTTPException(status_code=400, detail="音频文件内容为空")
-        
-        # 检查文件格式是否有效
-        if len(file_content) < 44:  # 至少要包含基本音频头信息
-            raise HTTPException(status_code=400, detail="无效的音频文件格式")
-        
-        # 保存临时文件
-        file_ext = os.path.splitext(file.filename)[1] or ".wav"
-        if file_ext.startswith('.'):
-            file_ext = file_ext[1:]
+        # 本地模型处理较小的上传时直接在内存中解码，不写临时文件；
+        # 其他服务需要上传文件，较大的上传也仍然落盘，避免占用过多内存
+        in_memory = (
+            isinstance(service, LocalWhisperService)
+            and file.size is not None
+            and file.size <= IN_MEMORY_AUDIO_LIMIT
+        )
+        hasher = content_hasher()
+        if in_memory:
+            content = await file.read()
+            # 大文件的哈希计算也放到线程池中，不阻塞事件循环
+            await run_in_threadpool(hasher.update, content)
+            file_size = len(content)
+        else:
+            # 保存临时文件
+            file_ext = os.path.splitext(file.filename)[1] or ".wav"
+            if file_ext.startswith('.'):
+                file_ext = file_ext[1:]
+                
+            temp_file_id = uuid.uuid4().hex
+            original_file_path = f"{TRANSCRIPTION_DIR}/{temp_file_id}.{file_ext}"
             
-        temp_file_id = str(uuid.uuid4())
-        original_file_path = f"{CACHE_DIR}/audio/transcriptions/{temp_file_id}.{file_ext}"
+            # 同步的读写和哈希放到线程池中执行，大文件上传不阻塞事件循环
+            file_size = await run_in_threadpool(save_upload, file.file, original_file_path, hasher)
         
-        with open(original_file_path, "wb") as f:
-            f.write(file_content)
-        
-        # 预处理音频：裁剪静音并转为WAV
-        processed_file_path = preprocess_audio(original_file_path)
+        # 检查文件大小和内容
+        if file_size < 44:  # 至少要包含基本音频头信息
+            if original_file_path:
+                os.unlink(original_file_path)
+            if file_size == 0:
+                raise HTTPException(status_code=400, detail="音频文件内容为空")
+            raise HTTPException(status_code=400, detail="无效的音频文件格式")
         
-        # 使用语音服务转写预处理后的音频
         try:
             actual_language = language or WHISPER_LANGUAGE
-            log.info(f"开始转写预处理后的音频: {processed_file_path}, 语言: {actual_language}")
             
-            result = service_manager.transcribe(
-                processed_file_path, 
-                service_id=service_id,
-                language=actual_language
-            )
+            # 相同内容、服务和语言的重复请求直接返回缓存结果
+            cache_key = (hasher.hexdigest(), service_id or service_manager.current_service, actual_language)
+            cached_result = get_cached_transcript(cache_key)
+            if cached_result is not None:
+                log.info(f"命中转写缓存: {file.filename}, 服务: {service.name}, 语言: {actual_language}")
+                if original_file_path:
+                    background_tasks.add_task(remove_temp_file, original_file_path)
+                return cached_result
+            
+            # 本地模型直接使用内存中预处理好的采样数组，不再导出和重新解码WAV；
+            # 启用VAD过滤时由模型跳过静音，不再重复裁剪。其他服务需要上传文件，仍然发送原始文件
+            if isinstance(service, LocalWhisperService):
+                audio_input = await run_in_threadpool(
+                    preprocess_audio,
+                    content if in_memory else original_file_path,
+                    trim_silence=not service.vad_filter,
+                )
+            else:
+                audio_input = original_file_path
+            
+            log.info(f"开始转写音频: {file.filename}, 服务: {service.name}, 语言: {actual_language}")
+            
+            result = await service.atranscribe(audio_input, actual_language)
             
             # 对中文结果进行繁体到简体的转换
             if result.get("text") and (actual_language.startswith("zh") or actual_language == "auto"):
                 original_text = result["text"]
                 result["text"] = convert_to_simplified_chinese(original_text)
             
+            cache_transcript(cache_key, result)
+            
+            # 响应发送后再清理临时文件，不占用请求的响应时间
+            if original_file_path:
+                background_tasks.add_task(remove_temp_file, original_file_path)
             return result
             
         except Exception as e:
             log.exception(f"转写音频时出错: {str(e)}")
+            # 出错时不会执行后台任务，直接清理临时文件
+            if original_file_path:
+                remove_temp_file(original_file_path)
             raise HTTPException(
                 status_code=500,
                 detail=f"转写音频时出错: {str(e)}"
             )
-        finally:
-            # 清理临时文件
-            try:
-                if original_file_path != processed_file_path:
-                    os.unlink(processed_file_path)
-                os.unlink(original_file_path)
-            except Exception as e:
-                log.warning(f"清理临时文件时出错: {str(e)}")
     
     except HTTPException:
         raise